@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.suite import compare, run_suite
+from benchmarks.synthetic import RepoShape
+
+def _parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        ext, _, weight = part.partition("=")
+        mix[ext.strip()] = float(weight or 1)
+    return mix
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time scaffolding and structure documentation on synthetic repositories."
+    )
+    parser.add_argument("--files", type=int, nargs="+", default=[1000, 10000],
+                        help="file counts of the synthetic repositories (default: 1000 10000)")
+    parser.add_argument("--breadth", type=int, default=8, help="subdirectories per directory")
+    parser.add_argument("--depth", type=int, default=3, help="directory levels")
+    parser.add_argument("--mix", type=_parse_mix, default=None,
+                        help="language weights, e.g. py=4,js=2,kt=1 (default: a mixed repo)")
+    parser.add_argument("--docstring-density", type=float, default=0.5,
+                        help="share of files with a module doc comment")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the median is reported")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="workers for the parallel documenter run (1 skips it)")
+    parser.add_argument("--skip-scaffold", action="store_true", help="only run the documenter benchmarks")
+    parser.add_argument("--work-dir", type=Path, default=Path(tempfile.gettempdir()) / "repo-structure-bench",
+                        help="where synthetic repositories are generated and kept between runs")
+    parser.add_argument("-o", "--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed slowdown against the baseline before failing (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    shapes = [
+        RepoShape(files, args.breadth, args.depth, args.mix, args.docstring_density)
+        for files in args.files
+    ]
+    results = run_suite(shapes, args.work_dir, args.repeat, args.jobs, not args.skip_scaffold)
+
+    for name, timing in results.items():
+        rate = f"  {timing['files'] / timing['median']:12.0f} files/s" if "files" in timing else ""
+        size = f"  {timing['bytes'] / 1024:10.1f} KB held" if "bytes" in timing else ""
+        print(f"{name:<40} {timing['median'] * 1000:10.1f} ms{rate}{size}")
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "shapes": [shape.as_dict() for shape in shapes]
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import argparse
+import random
+import re
+import sys
+import time
+
+from documenter.scanner import jsdoc, kotlin_java_docs, python_docstring
+
+# The patterns the IDE plugin uses, kept for comparison.
+PLUGIN_PYTHON_DOCSTRING = re.compile(r"""^[\s]*(?:'{3}|"{3})(.*?)(?:'{3}|"{3})""", re.DOTALL)
+PLUGIN_JSDOC = re.compile(rb"/\*\*(.*?)\*/", re.DOTALL)
+
+DEFAULT_SIZES = (64 * 1024, 256 * 1024, 1024 * 1024)
+# Worst case allowed per input byte; token-dense inputs cost one loop
+# iteration per token, plain text far less.
+DEFAULT_BUDGET_NS = 2000
+# Allowed growth of the per-byte time from the smallest to the largest size.
+DEFAULT_GROWTH = 3.0
+
+def _repeat(unit, size):
+    return unit * (size // len(unit) + 1)
+
+# name -> (scanner, input of about the given size). Every input is built to
+# end without a match so the scanners have to read all of it.
+ADVERSARIAL = {
+    "js/unterminated-doc": ("js", lambda size: b"/**" + _repeat(b"* ", size)),
+    "js/doc-openers": ("js", lambda size: _repeat(b"/**", size)),
+    "js/comment-openers": ("js", lambda size: b"/*" + _repeat(b"/*", size)),
+    "js/line-comments": ("js", lambda size: _repeat(b"//\n", size)),
+    "js/quote-storm": ("js", lambda size: _repeat(b"'\"", size)),
+    "js/empty-strings": ("js", lambda size: _repeat(b"''", size)),
+    "js/escaped-quotes": ("js", lambda size: b"'" + _repeat(b"\\'", size)),
+    "js/backslash-runs": ("js", lambda size: _repeat(b"\"" + b"\\" * 63 + b"\"", size)),
+    "js/template": ("js", lambda size: b"`" + _repeat(b"/** ${'`'} ", size)),
+    "py/unterminated": ("py", lambda size: '"""' + _repeat("x", size)),
+    "py/mixed-quotes": ("py", lambda size: '"""' + _repeat("'''", size)),
+    "py/escaped-quotes": ("py", lambda size: "'''" + _repeat("\\'''", size)),
+    "py/backslash-runs": ("py", lambda size: '"""' + _repeat("\\" * 63 + '"""' + "x", size)),
+    "py/whitespace": ("py", lambda size: _repeat(" \t\n", size) + "x"),
+    "kt/nested-comments": ("kt", lambda size: _repeat("/*", size)),
+    "kt/doc-storm": ("kt", lambda size: _repeat("/** d */ fun ", size)),
+    "kt/raw-strings": ("kt", lambda size: _repeat('"""x"""""', size)),
+    "kt/braces": ("kt", lambda size: _repeat("{", size // 2) + _repeat("}", size // 2)),
+    "kt/class-keywords": ("kt", lambda size: _repeat("class ", size)),
+    "kt/annotation-nesting": ("kt", lambda size: _repeat("/** d */ @A(", size // 2) + _repeat(")", size // 2)),
+    "kt/unclosed-annotations": ("kt", lambda size: _repeat("/** d */ @A(", size)),
+    "kt/nested-templates": ("kt", lambda size: '"' + _repeat('${"', size)),
+    "kt/template-braces": ("kt", lambda size: _repeat('"${ {{ "}" }} }"', size)),
+    "java/long-header": ("java", lambda size: _repeat("/** d */ public static " + "a " * 64, size)),
+    "java/char-literals": ("java", lambda size: _repeat("'\\''{'", size)),
+}
+
+FUZZ_TOKENS = {
+    "js": [b"/**", b"/*", b"*/", b"//", b"/", b"*", b"'", b'"', b"`", b"\\", b"\n", b" ", b"x", b"${"],
+    "py": ["'''", '"""', "'", '"', "\\", "\n", " ", "\t", "x"],
+    "kt": ["/**", "/*", "*/", "//", '"""', '"', "'", "\\", "{", "}", "(", ")", "\n", " ", "@A", "@file:", "${", "$",
+           "package", "class", "object", "companion", "enum", "fun", "interface", "val", "x", ".", ":"],
+}
+
+def _reference_jsdoc(data):
+    """Character by character version of scanner.jsdoc, used as the oracle when fuzzing."""
+    i, n = 0, len(data)
+    while i < n:
+        pair = data[i:i + 2]
+        if pair == b"//":
+            while i < n and data[i:i + 1] != b"\n":
+                i += 1
+            if i == n:
+                return None
+            i += 1
+        elif pair == b"/*":
+            start = i + 2
+            j = start
+            while j + 1 < n and data[j:j + 2] != b"*/":
+                j += 1
+            if j + 1 >= n:
+                return None
+            if j > start and data[start:start + 1] == b"*":
+                return data[start + 1:j]
+            i = j + 2
+        elif data[i:i + 1] in (b"'", b'"', b"`"):
+            quote = data[i:i + 1]
+            i += 1
+            while i < n:
+                c = data[i:i + 1]
+                if c == b"\\":
+                    i += 2
+                    continue
+                i += 1
+                if c == quote or (c == b"\n" and quote != b"`"):
+                    break
+        else:
+            i += 1
+    return None
+
+def _reference_python_docstring(text):
+    """Backreference regex with escapes, equivalent to scanner.python_docstring."""
+    match = re.match(r"""\s*('''|\"\"\")((?:\\.|(?!\1)[^\\])*)\1""", text, re.DOTALL)
+    return match.group(2) if match else None
+
+SCANNERS = {
+    "js": jsdoc,
+    "py": python_docstring,
+    "kt": kotlin_java_docs,
+    "java": lambda text: kotlin_java_docs(text, nested_comments=False, string_templates=False),
+}
+
+def time_scan(kind, data, repeat):
+    """Returns the fastest of repeat scans of data, in seconds."""
+    scan = SCANNERS[kind]
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scan(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def time_plugin_pattern(kind, data):
+    """Times the plugin's regex for kind, or returns None when it has none (Kotlin and Java go through PSI)."""
+    if kind not in ("js", "py"):
+        return None
+    pattern = PLUGIN_JSDOC if kind == "js" else PLUGIN_PYTHON_DOCSTRING
+    start = time.perf_counter()
+    pattern.search(data)
+    return time.perf_counter() - start
+
+REFERENCES = {"js": _reference_jsdoc, "py": _reference_python_docstring}
+
+# (scanner, source, expected (file doc, [(label, doc)])) for the Kotlin and
+# Java scanner, which has no reference implementation to fuzz against.
+EXTRACTION_CASES = [
+    ("kt", '/** File. */\npackage a\n/** Outer. */\nclass Outer {\n    /** Run. */\n    fun run() {}\n}\n',
+     ("File.", [("class Outer", "Outer."), ("fun Outer.run", "Run.")])),
+    ("kt", 'class Widget {\n    val s = "${"}"}"\n    /** After. */\n    fun after() = 1\n}\n',
+     ("", [("fun Widget.after", "After.")])),
+    ("kt", 'class Widget {\n    val s = """${ "}" + "{" } ${ mapOf(1 to "${"{"}") }"""\n'
+           '    /** After. */\n    fun after() = 1\n}\n/** Top. */\nfun top() = "\\${"\n',
+     ("", [("fun Widget.after", "After."), ("fun top", "Top.")])),
+    ("kt", 'class A {\n    val c = \'}\'\n    /* /* } */ } */\n    /** Inner. */\n    class B\n}\n',
+     ("", [("class A.B", "Inner.")])),
+    ("kt", 'class A {\n    companion object {\n        /** Make. */\n        fun make() = A()\n    }\n}\n',
+     ("", [("fun A.Companion.make", "Make.")])),
+    ("kt", '/** Run. */\n@A(/* ) */ ")", // )\n    x)\nfun run() {}\n/** Dangling. */\n@B(\n/** Next. */\nfun next() {}\n',
+     ("", [("fun run", "Run."), ("fun next", "Next.")])),
+    ("java", 'class A {\n    String s = "${";\n    /** Run. */\n    void run() {}\n}\n',
+     ("", [("method A.run", "Run.")])),
+    ("java", '/** Api. */\n@interface Api {}\n/* /* */ class B {\n    /** C. */\n    B() {}\n}\n',
+     ("", [("@interface Api", "Api."), ("method B.B", "C.")])),
+]
+
+def check_cases():
+    """Runs the Kotlin and Java scanner on EXTRACTION_CASES and returns the mismatches."""
+    mismatches = []
+    for kind, source, expected in EXTRACTION_CASES:
+        actual = SCANNERS[kind](source)
+        if actual != expected:
+            mismatches.append((kind, source, expected, actual))
+    return mismatches
+
+def fuzz(iterations, seed, max_tokens=40):
+    """Compares the scanners with their references on random token soups.
+
+    The Kotlin and Java scanner has no reference; it only has to get
+    through every input (as Kotlin and as Java) without an exception, and
+    check_cases() covers what it extracts.
+    Returns a list of (kind, input, expected, actual) mismatches.
+    """
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(iterations):
+        for kind, tokens in FUZZ_TOKENS.items():
+            data = tokens[0][:0].join(rng.choice(tokens) for _ in range(rng.randint(0, max_tokens)))
+            if kind == "kt":
+                SCANNERS["kt"](data)
+                SCANNERS["java"](data)
+                continue
+            expected, actual = REFERENCES[kind](data), SCANNERS[kind](data)
+            if expected != actual:
+                mismatches.append((kind, data, expected, actual))
+    return mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.fuzz",
+        description="Check the doc comment scanners on random and adversarial inputs against a per-byte time budget."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="input sizes in bytes for the adversarial inputs")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_NS, metavar="NS",
+                        help="maximum scan time per input byte (default: %(default)s ns)")
+    parser.add_argument("--growth", type=float, default=DEFAULT_GROWTH,
+                        help="maximum ratio between the per-byte times of the largest and smallest size")
+    parser.add_argument("--repeat", type=int, default=3, help="scans per input; the fastest counts")
+    parser.add_argument("--iterations", type=int, default=2000, help="random inputs per scanner for the fuzz check")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--plugin-patterns", type=int, metavar="BYTES", default=0,
+                        help="also time the plugin's regexes on inputs of this size, for comparison")
+    args = parser.parse_args(argv)
+    sizes = sorted(args.sizes)
+    failures = 0
+
+    mismatches = fuzz(args.iterations, args.seed)
+    for kind, data, expected, actual in mismatches[:10]:
+        print(f"MISMATCH {kind} {data!r}: expected {expected!r}, got {actual!r}")
+    print(f"fuzz: {args.iterations} random inputs per scanner, {len(mismatches)} mismatch(es)")
+    failures += len(mismatches)
+
+    mismatches = check_cases()
+    for kind, data, expected, actual in mismatches:
+        print(f"MISMATCH {kind} {data!r}: expected {expected!r}, got {actual!r}")
+    print(f"cases: {len(EXTRACTION_CASES)} Kotlin and Java extraction cases, {len(mismatches)} mismatch(es)")
+    failures += len(mismatches)
+
+    for name, (kind, generate) in ADVERSARIAL.items():
+        per_byte = []
+        for size in sizes:
+            data = generate(size)[:size]
+            per_byte.append(time_scan(kind, data, args.repeat) / len(data) * 1e9)
+        growth = per_byte[-1] / per_byte[0] if per_byte[0] else 1.0
+        status = "ok"
+        if max(per_byte) > args.budget or growth > args.growth:
+            status = "OVER"
+            failures += 1
+        timings = "  ".join(f"{ns:7.1f}" for ns in per_byte)
+        line = f"{name:<22} {timings}  ns/byte  x{growth:4.2f}  {status}"
+        if args.plugin_patterns:
+            data = generate(args.plugin_patterns)[:args.plugin_patterns]
+            plugin = time_plugin_pattern(kind, data)
+            if plugin is not None:
+                line += f"  (plugin regex {plugin / len(data) * 1e9:.1f} ns/byte at {len(data)} bytes)"
+        print(line)
+
+    print(f"sizes: {', '.join(str(size) for size in sizes)} bytes; budget {args.budget:g} ns/byte, "
+          f"growth x{args.growth:g}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import subprocess
+import sys
+
+from benchmarks.suite import REPO_ROOT
+
+# Cumulative import time allowed per entry point, in milliseconds. The
+# documenter runs from git hooks and watch mode and has to start fast;
+# the registries must not drag in what they register.
+BUDGETS = {
+    "documenter.__main__": 40,
+    "cli": 15,
+    "setup.builders": 5,
+}
+
+def parse_importtime(stderr):
+    """Returns [(module, self us, cumulative us, depth)] from -X importtime output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not own.strip().isdigit():
+            # The header line.
+            continue
+        stripped = name.lstrip()
+        imports.append((stripped, int(own), int(cumulative), (len(name) - len(stripped) - 1) // 2))
+    return imports
+
+def _subtree(imports, module):
+    """Returns the cumulative time of module and the records of the imports it triggered.
+
+    Records come in the order imports finish, so the imports made by a
+    top-level module are the records right before its own, back to the
+    previous top-level record (interpreter startup imports such as site).
+    """
+    for index, (name, _, cumulative, depth) in enumerate(imports):
+        if name == module and depth == 0:
+            start = index
+            while start > 0 and imports[start - 1][3] > 0:
+                start -= 1
+            return cumulative, imports[start:index + 1]
+    raise ValueError(f"{module} does not appear in the -X importtime output")
+
+def measure_import(module, repeat=5):
+    """Imports module in fresh interpreters and returns (cumulative us, records) of the fastest run.
+
+    One unmeasured run first makes sure the bytecode caches are written.
+    """
+    best = None
+    for run in range(repeat + 1):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+        )
+        total, imports = _subtree(parse_importtime(result.stderr), module)
+        if run and (best is None or total < best[0]):
+            best = (total, imports)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.importtime",
+        description="Fail when an entry point imports slower than its budget (measured with -X importtime)."
+    )
+    parser.add_argument("modules", nargs="*", help=f"modules to check (default: {', '.join(BUDGETS)})")
+    parser.add_argument("--budget", type=float, metavar="MS", help="override the budget of every module")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module; the fastest counts")
+    parser.add_argument("--top", type=int, default=8, help="heaviest imports listed for a module over budget")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for module in args.modules or BUDGETS:
+        budget = args.budget if args.budget is not None else BUDGETS.get(module)
+        total, imports = measure_import(module, args.repeat)
+        status = "ok" if budget is None or total / 1000 <= budget else "OVER"
+        limit = f" / {budget:g} ms" if budget is not None else ""
+        print(f"{module:<24} {total / 1000:8.1f} ms{limit}  {status}")
+        if status == "OVER":
+            failures += 1
+            for name, own, _, _ in sorted(imports, key=lambda record: record[1], reverse=True)[:args.top]:
+                print(f"    {own / 1000:8.1f} ms  {name}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import contextlib
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.synthetic import build_repo
+from documenter.engine import StructureDocumenter
+from documenter.extract import doc_lines
+from documenter.parallel import ParallelExtractor
+from documenter.snapshot import SnapshotIndex
+from documenter.walker import walk
+from setup.output import MemoryBackend
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+@contextlib.contextmanager
+def _quiet():
+    """Silences the benchmarked code, including subprocesses such as git."""
+    saved = [os.dup(1), os.dup(2)]
+    with open(os.devnull, 'w') as devnull:
+        os.dup2(devnull.fileno(), 1)
+        os.dup2(devnull.fileno(), 2)
+        try:
+            yield
+        finally:
+            os.dup2(saved[0], 1)
+            os.dup2(saved[1], 2)
+            for fd in saved:
+                os.close(fd)
+
+@contextlib.contextmanager
+def _working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def measure(run, repeat, prepare=None):
+    """Times run() repeat times; prepare() runs untimed before each call and its result is passed in."""
+    times = []
+    for _ in range(repeat):
+        argument = prepare() if prepare else None
+        start = time.perf_counter()
+        if prepare:
+            run(argument)
+        else:
+            run()
+        times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "min": min(times), "runs": repeat}
+
+def bench_plugin_setup(work_dir, repeat):
+    from setup_plugin import PluginSetup
+
+    def prepare():
+        return Path(tempfile.mkdtemp(dir=work_dir))
+
+    def run(base_path):
+        with _working_directory(base_path), _quiet():
+            PluginSetup(base_path).setup()
+
+    return measure(run, repeat, prepare)
+
+def bench_setup_main(work_dir, repeat, in_memory=False):
+    from setup.scaffold import scaffold
+
+    def prepare():
+        base_path = Path(tempfile.mkdtemp(dir=work_dir))
+        shutil.copytree(REPO_ROOT / "setup/templates", base_path / "setup/templates")
+        return base_path
+
+    def run(base_path):
+        with _working_directory(base_path), _quiet():
+            scaffold(base_path, MemoryBackend() if in_memory else None)
+
+    return measure(run, repeat, prepare)
+
+def bench_walk(root, repeat):
+    return measure(lambda: sum(1 for _ in walk(root)), repeat)
+
+def bench_extract(root, repeat):
+    def run():
+        for entry in walk(root):
+            if not entry.is_dir:
+                doc_lines(entry.path, entry.name)
+
+    return measure(run, repeat)
+
+def bench_document(root, output, repeat, workers=1):
+    extractor = ParallelExtractor(workers) if workers != 1 else None
+    return measure(lambda: StructureDocumenter(root, extractor=extractor).write(output), repeat)
+
+def bench_document_incremental(root, output, work_dir, repeat):
+    snapshot = SnapshotIndex(root, index_path=Path(work_dir) / "snapshot.pickle")
+    snapshot.update()
+
+    def run():
+        snapshot.update()
+        StructureDocumenter(root, snapshot).write(output)
+
+    timing = measure(run, repeat)
+    snapshot.save()
+    tracemalloc.start()
+    loaded = SnapshotIndex(root, index_path=snapshot.index_path).load()
+    timing["bytes"] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del loaded
+    return timing
+
+def run_suite(shapes, work_dir, repeat=3, workers=0, include_scaffold=True):
+    """Runs every benchmark and returns {name: timing} with file counts attached."""
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    output = work_dir / "REPOSITORY_STRUCTURE.md"
+    results = {}
+
+    if include_scaffold:
+        scratch = Path(tempfile.mkdtemp(dir=work_dir))
+        try:
+            results["scaffold/plugin_setup"] = bench_plugin_setup(scratch, repeat)
+            results["scaffold/setup_main"] = bench_setup_main(scratch, repeat)
+            results["scaffold/setup_main_memory"] = bench_setup_main(scratch, repeat, in_memory=True)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    for shape in shapes:
+        root = build_repo(work_dir / "repos" / shape.label(), shape)
+        label = shape.label()
+        results[f"walk/{label}"] = bench_walk(root, repeat)
+        results[f"extract/{label}"] = bench_extract(root, repeat)
+        results[f"document/{label}"] = bench_document(root, output, repeat)
+        if workers != 1:
+            results[f"document_parallel/{label}"] = bench_document(root, output, repeat, workers or None)
+        results[f"document_incremental/{label}"] = bench_document_incremental(root, output, work_dir, repeat)
+        for name in results:
+            if name.endswith(f"/{label}"):
+                results[name]["files"] = shape.files
+
+    return results
+
+def compare(results, baseline, threshold):
+    """Returns (name, baseline seconds, current seconds, ratio) for every benchmark slower than allowed."""
+    regressions = []
+    for name, timing in results.items():
+        previous = baseline.get(name)
+        if previous is None or previous["median"] <= 0:
+            continue
+        ratio = timing["median"] / previous["median"]
+        if ratio > 1 + threshold:
+            regressions.append((name, previous["median"], timing["median"], ratio))
+    return regressions
@@ -0,0 +1,99 @@
+import json
+import os
+import random
+import shutil
+from pathlib import Path
+
+# extension -> (documented template, undocumented template)
+SOURCES = {
+    "py": ('"""Module {n}.\n\nGenerated for benchmarking."""\n\ndef f{n}():\n    """Function {n}."""\n    return {n}\n',
+           "def f{n}():\n    return {n}\n"),
+    "js": ("/**\n * Module {n}.\n */\nexport function f{n}() {{ return {n}; }}\n",
+           "export function f{n}() {{ return {n}; }}\n"),
+    "ts": ("/** Module {n}. */\nexport const f{n} = (): number => {n};\n",
+           "export const f{n} = (): number => {n};\n"),
+    "kt": ("/** Class {n}. */\nclass C{n} {{\n    fun f() = {n}\n}}\n",
+           "class C{n} {{\n    fun f() = {n}\n}}\n"),
+    "java": ("/** Class {n}. */\npublic class C{n} {{\n    int f() {{ return {n}; }}\n}}\n",
+             "public class C{n} {{\n    int f() {{ return {n}; }}\n}}\n"),
+    "md": ("# Notes {n}\n", "# Notes {n}\n"),
+}
+
+DEFAULT_MIX = {"py": 4, "js": 2, "ts": 2, "kt": 1, "java": 1, "md": 1}
+SHAPE_MARKER = ".synthetic-shape.json"
+
+class RepoShape:
+    """Describes a synthetic repository.
+
+    breadth and depth span the directory tree (breadth ** depth leaf
+    directories at most), files are spread over all of its directories,
+    mix weights the languages and docstring_density is the share of
+    source files that carry a module doc comment.
+    """
+
+    def __init__(self, files=1000, breadth=8, depth=3, mix=None, docstring_density=0.5, seed=0):
+        self.files = files
+        self.breadth = breadth
+        self.depth = depth
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.docstring_density = docstring_density
+        self.seed = seed
+
+    def as_dict(self):
+        return {
+            "files": self.files,
+            "breadth": self.breadth,
+            "depth": self.depth,
+            "mix": self.mix,
+            "docstring_density": self.docstring_density,
+            "seed": self.seed
+        }
+
+    def label(self):
+        """Returns a name that differs between any two shapes: 1000f-b8-d3-py4js2ts2kt1java1md1-doc0.5-s0 by default."""
+        mix = "".join(f"{ext}{weight:g}" for ext, weight in self.mix.items())
+        return f"{self.files}f-b{self.breadth}-d{self.depth}-{mix}-doc{self.docstring_density:g}-s{self.seed}"
+
+def _directories(breadth, depth):
+    directories = [""]
+    level = [""]
+    for _ in range(depth):
+        level = [f"{parent}/d{index}" if parent else f"d{index}" for parent in level for index in range(breadth)]
+        directories.extend(level)
+    return directories
+
+def build_repo(path: Path, shape: RepoShape):
+    """Creates the synthetic repository at path unless one with the same shape is already there.
+
+    Anything else at path, such as a repository of another shape or one
+    left half-built, is deleted first so no stale files remain.
+    """
+    path = Path(path)
+    marker = path / SHAPE_MARKER
+    try:
+        with open(marker, 'r') as f:
+            if json.load(f) == shape.as_dict():
+                return path
+    except (FileNotFoundError, ValueError):
+        pass
+    if path.exists():
+        shutil.rmtree(path)
+
+    rng = random.Random(shape.seed)
+    directories = _directories(shape.breadth, shape.depth)
+    for directory in directories:
+        (path / directory).mkdir(parents=True, exist_ok=True)
+
+    extensions = list(shape.mix)
+    weights = [shape.mix[ext] for ext in extensions]
+    for n in range(shape.files):
+        directory = directories[n % len(directories)]
+        ext = rng.choices(extensions, weights)[0]
+        documented, plain = SOURCES.get(ext, ("{n}\n", "{n}\n"))
+        template = documented if rng.random() < shape.docstring_density else plain
+        with open(os.path.join(path, directory, f"file{n}.{ext}"), 'w') as f:
+            f.write(template.format(n=n))
+
+    with open(marker, 'w') as f:
+        json.dump(shape.as_dict(), f)
+    return path
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import argparse
+import importlib
+import sys
+
+# Subcommand -> ("module:function", help). Only the module of the command
+# being run is imported, so e.g. "document" never loads the scaffold
+# builders or the plugin sources embedded in setup_plugin.py.
+COMMANDS = {
+    "scaffold": ("setup.scaffold:main", "scaffold the plugin from setup/templates (setup.py)"),
+    "plugin": ("setup_plugin:main", "set up the plugin from its embedded sources (setup_plugin.py)"),
+    "init": ("create_project_structure:main", "create the setup/ templates (create_project_structure.py)"),
+    "document": ("documenter.__main__:main", "write REPOSITORY_STRUCTURE.md (python -m documenter)"),
+    "bench": ("benchmarks.__main__:main", "run the benchmark suite (python -m benchmarks)"),
+    "check-imports": ("benchmarks.importtime:main", "check import times against their budgets"),
+    "fuzz": ("benchmarks.fuzz:main", "fuzz and time the doc comment scanners"),
+}
+
+def resolve(command):
+    """Imports and returns the main function of a subcommand."""
+    module, _, function = COMMANDS[command][0].partition(":")
+    return getattr(importlib.import_module(module), function)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Repository structure tools.",
+        epilog="\n".join(f"  {name:<14} {info}" for name, (_, info) in COMMANDS.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("command", choices=COMMANDS, metavar="command", help="one of the commands below")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the command (see command -h)")
+    args = parser.parse_args(argv)
+
+    # Usage messages of the subcommand then read "cli.py <command>".
+    sys.argv[0] = f"{parser.prog} {args.command}"
+    return resolve(args.command)(args.args)
+
+if __name__ == "__main__":
+    main()
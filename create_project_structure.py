@@ -1,43 +1,91 @@
 #!/usr/bin/env python3
-import os
+import argparse
+import ast
+import hashlib
+import json
 from pathlib import Path
 import shutil
 from textwrap import dedent
 
+from setup import profiling
+
+def _literal_text(node):
+    """Evaluates a string constant, optionally followed by .strip() and friends."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if (isinstance(node, ast.Call) and not node.args and not node.keywords
+            and isinstance(node.func, ast.Attribute) and node.func.attr in ("strip", "lstrip", "rstrip")):
+        text = _literal_text(node.func.value)
+        return getattr(text, node.func.attr)() if text is not None else None
+    return None
+
+def _extract_kotlin_files(source):
+    """Returns the files dict of PluginSetup.create_kotlin_files from one parse of setup_plugin.py."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        print(f"Warning: could not parse setup_plugin.py ({e}). Creating new templates.")
+        return {}
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.FunctionDef) or node.name != "create_kotlin_files":
+            continue
+        for statement in node.body:
+            if (isinstance(statement, ast.Assign) and isinstance(statement.value, ast.Dict)
+                    and any(isinstance(target, ast.Name) and target.id == "files" for target in statement.targets)):
+                return {
+                    key.value: _literal_text(value).strip()
+                    for key, value in zip(statement.value.keys, statement.value.values)
+                    if isinstance(key, ast.Constant) and _literal_text(value) is not None
+                }
+    return {}
+
 class ProjectStructureCreator:
     def __init__(self, base_path: Path):
         self.base_path = base_path
         self.setup_dir = base_path / "setup"
-        self.existing_code = self._get_existing_code()
+        with profiling.phase("_get_existing_code"):
+            self.existing_code = self._get_existing_code()
 
     def _get_existing_code(self):
-        """Extract the existing code from your current setup_plugin.py"""
-        kotlin_files = {
-            "RepoStructurePlugin.kt": None,
-            "FileChangeListener.kt": None,
-            "RepoStructureDocumenter.kt": None,
-            "UpdateStructureAction.kt": None
-        }
+        """Extract the existing code from your current setup_plugin.py
 
-        try:
-            with open(self.base_path / "setup_plugin.py", 'r') as f:
-                content = f.read()
+        The result is cached in .setup-cache/ together with the size, mtime
+        and SHA-256 of setup_plugin.py, so an unchanged file costs one stat.
+        """
+        source_path = self.base_path / "setup_plugin.py"
+        cache_path = self.base_path / ".setup-cache/kotlin_sources.json"
 
-            # Extract Kotlin code blocks
-            for file in kotlin_files.keys():
-                start = content.find(f'"{file}": \'\'\'')
-                if start != -1:
-                    end = content.find("'''", start + len(file) + 7)
-                    kotlin_files[file] = content[start + len(file) + 7:end].strip()
+        try:
+            stat = source_path.stat()
         except FileNotFoundError:
             print("Warning: setup_plugin.py not found. Creating new templates.")
+            return {}
 
+        try:
+            with open(cache_path, 'r') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cache = {}
+        if cache.get("size") == stat.st_size and cache.get("mtime_ns") == stat.st_mtime_ns:
+            return cache["files"]
+
+        with open(source_path, 'rb') as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+        if cache.get("sha256") == digest:
+            kotlin_files = cache["files"]
+        else:
+            kotlin_files = _extract_kotlin_files(source)
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest, "files": kotlin_files}, f)
         return kotlin_files
 
     def create_directory_structure(self):
         """Create the basic directory structure"""
         directories = [
-            "setup/builders",
             "setup/templates/gradle",
             "setup/templates/kotlin",
             "setup/templates/plugin"
@@ -49,150 +97,12 @@ class ProjectStructureCreator:
     def create_init_files(self):
         """Create __init__.py files"""
         init_locations = [
-            "setup",
-            "setup/builders"
+            "setup"
         ]
 
         for location in init_locations:
             (self.base_path / location / "__init__.py").touch()
 
-    def create_main_setup(self):
-        """Create the main setup.py file"""
-        content = '''
-        #!/usr/bin/env python3
-        from pathlib import Path
-        from setup.builders.directory_builder import DirectoryBuilder
-        from setup.builders.gradle_builder import GradleBuilder
-        from setup.builders.kotlin_builder import KotlinBuilder
-
-        def main():
-            base_path = Path.cwd()
-            builders = [
-                DirectoryBuilder(base_path),
-                GradleBuilder(base_path),
-                KotlinBuilder(base_path)
-            ]
-            
-            for builder in builders:
-                builder.build()
-
-        if __name__ == "__main__":
-            main()
-        '''
-
-        with open(self.base_path / "setup.py", 'w') as f:
-            f.write(dedent(content))
-
-        # Make executable
-        os.chmod(self.base_path / "setup.py", 0o755)
-
-    def create_builders(self):
-        """Create builder class files"""
-        # Directory Builder
-        directory_builder = '''
-        from pathlib import Path
-
-        class DirectoryBuilder:
-            def __init__(self, base_path: Path):
-                self.base_path = base_path
-                self.plugin_path = base_path / "repo-structure-plugin"
-
-            def build(self):
-                """Creates the basic directory structure for the plugin."""
-                directories = [
-                    "src/main/kotlin/com/your/plugin",
-                    "src/main/resources/META-INF",
-                    "src/test/kotlin/com/your/plugin",
-                    "gradle/wrapper"
-                ]
-
-                for directory in directories:
-                    (self.plugin_path / directory).mkdir(parents=True, exist_ok=True)
-        '''
-
-        # Gradle Builder
-        gradle_builder = '''
-        from pathlib import Path
-        from string import Template
-
-        class GradleBuilder:
-            def __init__(self, base_path: Path):
-                self.base_path = base_path
-                self.plugin_path = base_path / "repo-structure-plugin"
-                self.template_dir = base_path / "setup/templates/gradle"
-
-            def build(self):
-                """Creates all Gradle-related files."""
-                self._create_build_gradle()
-                self._create_settings_gradle()
-                self._create_gradle_properties()
-
-            def _create_build_gradle(self):
-                with open(self.template_dir / "build.gradle.kts.template", 'r') as f:
-                    template = Template(f.read())
-                content = template.substitute({})
-                with open(self.plugin_path / "build.gradle.kts", 'w') as f:
-                    f.write(content)
-
-            def _create_settings_gradle(self):
-                with open(self.template_dir / "settings.gradle.kts.template", 'r') as f:
-                    content = f.read()
-                with open(self.plugin_path / "settings.gradle.kts", 'w') as f:
-                    f.write(content)
-
-            def _create_gradle_properties(self):
-                with open(self.template_dir / "gradle.properties.template", 'r') as f:
-                    content = f.read()
-                with open(self.plugin_path / "gradle.properties", 'w') as f:
-                    f.write(content)
-        '''
-
-        # Kotlin Builder
-        kotlin_builder = '''
-        from pathlib import Path
-
-        class KotlinBuilder:
-            def __init__(self, base_path: Path):
-                self.base_path = base_path
-                self.plugin_path = base_path / "repo-structure-plugin"
-                self.template_dir = base_path / "setup/templates/kotlin"
-                self.kotlin_dir = self.plugin_path / "src/main/kotlin/com/your/plugin"
-
-            def build(self):
-                """Creates all Kotlin source files."""
-                kotlin_files = [
-                    "RepoStructurePlugin.kt",
-                    "FileChangeListener.kt",
-                    "RepoStructureDocumenter.kt",
-                    "UpdateStructureAction.kt"
-                ]
-                
-                for file in kotlin_files:
-                    with open(self.template_dir / f"{file}.template", 'r') as f:
-                        content = f.read()
-                    with open(self.kotlin_dir / file, 'w') as f:
-                        f.write(content)
-
-                self._create_plugin_xml()
-
-            def _create_plugin_xml(self):
-                plugin_template_dir = self.base_path / "setup/templates/plugin"
-                with open(plugin_template_dir / "plugin.xml.template", 'r') as f:
-                    content = f.read()
-                with open(self.plugin_path / "src/main/resources/META-INF/plugin.xml", 'w') as f:
-                    f.write(content)
-        '''
-
-        builders = {
-            "directory_builder.py": directory_builder,
-            "gradle_builder.py": gradle_builder,
-            "kotlin_builder.py": kotlin_builder
-        }
-
-        for filename, content in builders.items():
-            with open(self.base_path / "setup/builders" / filename, 'w') as f:
-                f.write(dedent(content))
-
     def create_templates(self):
         """Create template files"""
         # Gradle templates
@@ -200,24 +110,24 @@ class ProjectStructureCreator:
             "build.gradle.kts.template": '''
             plugins {
                 id("java")
-                id("org.jetbrains.kotlin.jvm") version "1.9.22"
-                id("org.jetbrains.intellij") version "1.17.2"
+                id("org.jetbrains.kotlin.jvm") version "${kotlin_version}"
+                id("org.jetbrains.intellij") version "${intellij_gradle_plugin_version}"
             }
             
-            group = "com.your.plugin"
-            version = "1.0-SNAPSHOT"
+            group = "${group}"
+            version = "${plugin_version}"
             
             repositories {
                 mavenCentral()
             }
             
             kotlin {
-                jvmToolchain(17)
+                jvmToolchain(${jvm_toolchain})
             }
             
             intellij {
-                version.set("2023.3.3")
-                type.set("IC")
+                version.set("${intellij_version}")
+                type.set("${platform_type}")
                 plugins.set(listOf(
                     "com.intellij.java",
                     "org.jetbrains.kotlin"
@@ -234,8 +144,8 @@ class ProjectStructureCreator:
                 }
             
                 patchPluginXml {
-                    sinceBuild.set("233")
-                    untilBuild.set("241.*")
+                    sinceBuild.set("${since_build}")
+                    untilBuild.set("${until_build}")
                 }
             
                 runIde {
@@ -264,7 +174,7 @@ class ProjectStructureCreator:
         # Create plugin.xml template
         plugin_xml = '''
         <idea-plugin>
-            <id>com.your.plugin.repo-structure</id>
+            <id>${plugin_id}</id>
             <name>Repository Structure Documenter</name>
             <vendor>Your Name</vendor>
             <description>Automatically generates and updates repository structure documentation</description>
@@ -301,6 +211,7 @@ class ProjectStructureCreator:
         .DS_Store
         __pycache__/
         venv/
+        .setup-cache/
         '''
 
         with open(self.base_path / ".gitignore", 'w') as f:
@@ -309,17 +220,27 @@ class ProjectStructureCreator:
     def setup(self):
         """Run the complete setup process"""
         print("Creating project structure...")
-        self.create_directory_structure()
-        self.create_init_files()
-        self.create_main_setup()
-        self.create_builders()
-        self.create_templates()
-        self.create_gitignore()
+        steps = [
+            self.create_directory_structure,
+            self.create_init_files,
+            self.create_templates,
+            self.create_gitignore
+        ]
+        for step in steps:
+            with profiling.phase(step.__name__):
+                step()
         print("Project structure created successfully!")
 
-def main():
-    creator = ProjectStructureCreator(Path.cwd())
-    creator.setup()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create the setup/ templates in the current directory.")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiling.enable_from_args(args, "create_project_structure.py")
+    try:
+        creator = ProjectStructureCreator(Path.cwd())
+        creator.setup()
+    finally:
+        profiling.finish()
     print("""
 Setup complete! Your project structure has been created.
 
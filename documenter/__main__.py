@@ -0,0 +1,154 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from documenter.engine import StructureDocumenter
+from documenter.extract import DEFAULT_LIMITS, Limits
+from setup import profiling
+
+# Git hooks and editors start the documenter for every change, so modules
+# only some options need (the SQLite cache, the process pool, shards,
+# snapshots, git, inotify) are imported where those options are handled.
+# Same as doccache.DEFAULT_MAX_BYTES.
+DEFAULT_CACHE_MB = 64
+
+def document(root, args, limits, snapshot=None, changed=None, cache=None):
+    """Writes the structure document for one root."""
+    if snapshot is not None:
+        git = None
+        if not args.no_git and not args.no_ignore:
+            from documenter.gitindex import GitIndex
+            with profiling.phase(f"git.open {root}"):
+                git = GitIndex.open(root)
+        head = dirty = None
+        if git is not None:
+            with profiling.phase(f"git.diff {root}"):
+                head = git.head()
+                since = git.changed_since(snapshot.commit)
+                dirty = since if head == snapshot.commit else git.dirty()
+            if changed is None and since is not None:
+                # Paths dirty last time may be clean again, or gone, without git reporting them.
+                changed = since + snapshot.dirty
+        with profiling.phase(f"snapshot.update {root}"):
+            rescanned = snapshot.update(changed)
+        snapshot.commit = head
+        snapshot.dirty = dirty or []
+        print(f"{root}: {len(rescanned)} director(ies) rescanned", file=sys.stderr)
+
+    extractor = None
+    if args.jobs != 1:
+        from documenter.parallel import ParallelExtractor
+        extractor = ParallelExtractor(args.jobs or None, limits=limits, cache=cache)
+    documenter = StructureDocumenter(root, snapshot, extractor, limits, not args.no_ignore, cache)
+    with profiling.phase(f"generate {root}"):
+        if args.shard_depth:
+            from documenter.shards import ShardWriter
+            shards = ShardWriter(documenter, args.shard_depth)
+            shards.write()
+        elif args.output == "-":
+            documenter.generate(sys.stdout)
+        else:
+            output_path = documenter.write(args.output)
+    if args.shard_depth:
+        print(f"Documented {root}: {len(shards.written)} shard(s) written, {shards.unchanged} unchanged",
+              file=sys.stderr)
+    elif args.output != "-":
+        print(f"Documented {root} -> {output_path}", file=sys.stderr)
+
+    if snapshot is not None:
+        with profiling.phase(f"snapshot.save {root}"):
+            snapshot.save()
+
+    if cache is not None:
+        print(f"{root}: docs {cache.report()}", file=sys.stderr)
+        with profiling.phase(f"cache.flush {root}"):
+            cache.flush()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m documenter",
+        description="Generate REPOSITORY_STRUCTURE.md for one or more directories without an IDE."
+    )
+    parser.add_argument("roots", nargs="+", type=Path, help="directories to document")
+    parser.add_argument("-o", "--output", help="output file, or - for stdout (single root only)")
+    parser.add_argument("--shard-depth", type=int, default=0, metavar="N",
+                        help="write one document per directory down to N levels, with the root one as an index")
+    parser.add_argument("--incremental", action="store_true",
+                        help="keep a snapshot index and rescan only directories that changed")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="worker processes for doc extraction (default: one per core, 1 disables the pool)")
+    parser.add_argument("--max-file-size", type=int, default=DEFAULT_LIMITS.max_size, metavar="BYTES",
+                        help="list larger files as skipped instead of extracting their docs")
+    parser.add_argument("--scan-prefix", type=int, default=DEFAULT_LIMITS.prefix, metavar="BYTES",
+                        help="stop looking for a doc comment after this many bytes")
+    parser.add_argument("--no-ignore", action="store_true",
+                        help="document everything instead of pruning entries matched by .gitignore files")
+    parser.add_argument("--no-git", action="store_true",
+                        help="with --incremental, stat every known directory instead of asking git what changed")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="extract every file instead of using the persistent docstring cache")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_MB, metavar="MB",
+                        help="evict the least recently used cached docs beyond this size")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and regenerate when files change (implies --incremental)")
+    parser.add_argument("--debounce", type=float, default=0.5, metavar="SECONDS",
+                        help="quiet period that closes a batch of changes in watch mode")
+    parser.add_argument("--poll-interval", type=float, default=2.0, metavar="SECONDS",
+                        help="scan interval when inotify is unavailable")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    limits = Limits(args.max_file_size, args.scan_prefix)
+
+    if args.output and len(args.roots) > 1:
+        parser.error("--output can only be used with a single root")
+
+    if args.shard_depth and args.output:
+        parser.error("--output cannot be used with --shard-depth")
+
+    if args.watch and args.output == "-":
+        parser.error("--watch cannot write to stdout")
+
+    for root in args.roots:
+        if not root.is_dir():
+            parser.error(f"{root} is not a directory")
+
+    profiling.enable_from_args(args, "documenter")
+    if not args.no_cache:
+        from documenter.doccache import DocCache
+    if args.incremental or args.watch:
+        from documenter.snapshot import SnapshotIndex
+    snapshots = {}
+    caches = {}
+    try:
+        for root in args.roots:
+            if not args.no_cache:
+                caches[root] = DocCache.for_root(root, args.cache_size * 1024 * 1024)
+            if args.incremental or args.watch:
+                with profiling.phase(f"snapshot.load {root}"):
+                    snapshots[root] = SnapshotIndex(root, limits=limits, gitignore=not args.no_ignore,
+                                                    cache=caches.get(root)).load()
+            document(root, args, limits, snapshots.get(root), cache=caches.get(root))
+    finally:
+        profiling.finish()
+
+    if not args.watch:
+        return
+
+    from documenter.watch import WatchDaemon
+    roots = {os.path.abspath(root): root for root in args.roots}
+
+    def regenerate(root_path, changed):
+        root = roots[root_path]
+        document(root, args, limits, snapshots[root], changed, caches.get(root))
+
+    daemon = WatchDaemon(list(roots), regenerate, args.debounce, poll_interval=args.poll_interval,
+                         gitignore=not args.no_ignore)
+    print(f"Watching {', '.join(str(root) for root in args.roots)} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+
+BUFFER_SIZE = 1024 * 1024
+TEMP_SUFFIX = ".partial"
+
+def is_temporary(name):
+    """Tells whether a file name belongs to a document that is still being written."""
+    return name.startswith(".") and name.endswith(TEMP_SUFFIX)
+
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+# The mode a plain open() creates files with. Read once at import: umask
+# can only be read by setting it, which would race with threads creating
+# files meanwhile.
+FILE_MODE = 0o666 & ~_umask()
+
+@contextlib.contextmanager
+def atomic_open(path, encoding="utf-8", buffering=BUFFER_SIZE):
+    """Opens a buffered text file that replaces path only once the block succeeds.
+
+    Writes go to a hidden temporary file next to path (so the final
+    os.replace never crosses a file system), which walks skip through
+    is_temporary; readers see either the old file or the complete new one,
+    and a failure leaves the old file alone.
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=TEMP_SUFFIX, dir=path.parent)
+    try:
+        with open(fd, 'w', encoding=encoding, buffering=buffering) as f:
+            yield f
+        # mkstemp creates the file 0600.
+        os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        raise
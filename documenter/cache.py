@@ -0,0 +1,15 @@
+import hashlib
+import os
+from pathlib import Path
+
+def cache_dir(root: Path):
+    """Returns the per-repository cache directory for root, creating it if needed.
+
+    Caches live under $XDG_CACHE_HOME (or ~/.cache) rather than inside the
+    documented tree so they never show up in the generated structure.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    key = hashlib.sha1(str(Path(root).resolve()).encode("utf-8")).hexdigest()[:16]
+    path = Path(base) / "repo-structure" / key
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from documenter.cache import cache_dir
+from documenter.extract import DEFAULT_LIMITS, DOCUMENTED_EXTENSIONS, doc_lines, extension
+
+CACHE_VERSION = 5
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Rough per-row overhead added to the stored text when measuring the cache.
+ROW_OVERHEAD = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    name TEXT NOT NULL,
+    limits TEXT NOT NULL,
+    lines TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_by_content ON docs (digest, name, limits);
+CREATE INDEX IF NOT EXISTS docs_by_use ON docs (used);
+"""
+
+def _digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+class DocCache:
+    """Persistent SQLite cache of extracted file documentation.
+
+    Rows are keyed by path and checked against the file's (size, mtime_ns),
+    so a warm run answers unchanged files from one indexed lookup without
+    opening them. When the stat differs the file is hashed and looked up by
+    content (plus file name and limits, which shape the lines), so a
+    checkout that only touches mtimes still extracts nothing. lookup() and
+    store() are split so a caller can extract the misses elsewhere, as
+    ParallelExtractor does on its pool; lines() does both. Every hit
+    bumps a use counter; flush() commits and drops the least recently used
+    rows once the stored text exceeds max_bytes.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.content_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            self._db.execute("DROP TABLE IF EXISTS docs")
+            self._db.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self._db.executescript(SCHEMA)
+        self._clock = self._db.execute("SELECT COALESCE(MAX(used), 0) FROM docs").fetchone()[0]
+        self._touched = []
+        # {path: (stat, digest)} of lookups that missed and wait for store()
+        self._pending = {}
+
+    @classmethod
+    def for_root(cls, root, max_bytes=DEFAULT_MAX_BYTES):
+        """Opens the cache kept in root's cache directory."""
+        return cls(cache_dir(root) / "docs.sqlite", max_bytes)
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def _insert(self, path, stat, digest, name, key, lines):
+        # Caller holds the lock.
+        text = json.dumps(list(lines))
+        self._db.execute(
+            "INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime_ns, digest, name, key, text,
+             len(text) + len(path) + ROW_OVERHEAD, self._tick())
+        )
+
+    def lookup(self, path, name, limits=DEFAULT_LIMITS):
+        """Returns the cached doc lines for a file, or None when it has to be extracted and store()d."""
+        if extension(name) not in DOCUMENTED_EXTENSIONS:
+            return []
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return []
+        if stat.st_size > limits.max_size:
+            # doc_lines does not read oversized files, so there is nothing to save.
+            return doc_lines(path, name, limits)
+
+        key = json.dumps(limits)
+        path = os.fspath(path)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime_ns, limits, lines FROM docs WHERE path = ?", (path,)
+            ).fetchone()
+            if row is not None and row[:3] == (stat.st_size, stat.st_mtime_ns, key):
+                self.hits += 1
+                self._touched.append((self._tick(), path))
+                return json.loads(row[3])
+
+        try:
+            digest = _digest(path)
+        except OSError:
+            # Gone or unreadable since the stat; doc_lines has nothing either.
+            return []
+        with self._lock:
+            row = self._db.execute(
+                "SELECT lines FROM docs WHERE digest = ? AND name = ? AND limits = ? LIMIT 1",
+                (digest, name, key)
+            ).fetchone()
+            if row is not None:
+                self.content_hits += 1
+                lines = json.loads(row[0])
+                self._insert(path, stat, digest, name, key, lines)
+                return lines
+            self._pending[path] = (stat, digest)
+        return None
+
+    def store(self, path, name, limits, lines):
+        """Records the doc lines extracted for a file that missed lookup()."""
+        path = os.fspath(path)
+        with self._lock:
+            self.misses += 1
+            pending = self._pending.pop(path, None)
+            if pending is not None:
+                self._insert(path, pending[0], pending[1], name, json.dumps(limits), lines)
+        return lines
+
+    def lines(self, path, name, limits=DEFAULT_LIMITS):
+        """Drop-in replacement for doc_lines that goes through the cache."""
+        cached = self.lookup(path, name, limits)
+        if cached is not None:
+            return cached
+        return self.store(path, name, limits, doc_lines(path, name, limits))
+
+    def _evict(self):
+        excess = self._db.execute("SELECT COALESCE(SUM(bytes), 0) FROM docs").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return 0
+        victims = []
+        for path, size in self._db.execute("SELECT path, bytes FROM docs ORDER BY used"):
+            victims.append((path,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM docs WHERE path = ?", victims)
+        return len(victims)
+
+    def flush(self):
+        """Records pending uses, evicts over the size cap, commits and resets the counters.
+
+        Returns the number of evicted rows.
+        """
+        with self._lock:
+            self._db.executemany("UPDATE docs SET used = ? WHERE path = ?", self._touched)
+            self._touched = []
+            self._pending.clear()
+            self.hits = self.content_hits = self.misses = 0
+            evicted = self._evict()
+            self._db.commit()
+        return evicted
+
+    def report(self):
+        """Summarizes the lookups since the last flush()."""
+        return f"{self.hits} cached, {self.content_hits} matched by content, {self.misses} extracted"
+
+    def close(self):
+        self.flush()
+        self._db.close()
@@ -0,0 +1,83 @@
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from documenter.atomic import atomic_open
+from documenter.extract import DEFAULT_LIMITS, doc_lines
+from documenter.ignore import IgnoreMatcher
+from documenter.walker import OUTPUT_NAME, tree_line, walk
+
+COPY_CHUNK = 64 * 1024
+
+class StructureDocumenter:
+    """Generates REPOSITORY_STRUCTURE.md without an IDE.
+
+    Produces the same document as the plugin's RepoStructureDocumenter, but
+    from a single os.scandir walk. The document is a generator of text
+    chunks: tree lines are yielded as entries are produced and the File
+    Documentation section is spooled to a temporary file and streamed back
+    in fixed-size chunks, so memory use does not grow with the repository
+    and no chunk is ever copied into a larger string. With a
+    SnapshotIndex the document is re-emitted from the index instead of the
+    disk; with a ParallelExtractor file docs are extracted on a process pool.
+    Unless gitignore is False, entries matched by .gitignore files are
+    pruned and replaced by an "N entries hidden" line. A DocCache answers
+    unchanged files without reading them.
+    """
+
+    def __init__(self, root: Path, snapshot=None, extractor=None, limits=DEFAULT_LIMITS, gitignore=True, cache=None):
+        self.root = Path(root)
+        self.limits = limits
+        self.snapshot = snapshot
+        self.extractor = extractor
+        self.gitignore = gitignore
+        self.cache = cache
+
+    def header(self):
+        now = datetime.now().isoformat()
+        return f"# {self.root.resolve().name.upper()} Structure\nLast updated: {now}\n\n"
+
+    def entries(self):
+        """Yields (entry, doc lines) pairs in document order."""
+        if self.snapshot is not None:
+            yield from self.snapshot.iter_entries()
+            return
+        ignore = IgnoreMatcher(self.root) if self.gitignore else None
+        if self.extractor is not None:
+            yield from self.extractor.annotate(walk(self.root, ignore))
+            return
+        extract = self.cache.lines if self.cache is not None else doc_lines
+        for entry in walk(self.root, ignore):
+            yield entry, () if entry.is_dir else extract(entry.path, entry.name, self.limits)
+
+    def chunks(self, docs):
+        """Yields the document as text chunks, spooling the File Documentation section to docs."""
+        yield self.header()
+        yield "## Directory Structure\n```\n"
+
+        for entry, lines in self.entries():
+            yield tree_line(entry)
+            if entry.is_dir:
+                docs.write(f"\n### {entry.relpath}\n")
+            else:
+                docs.writelines(lines)
+
+        yield "\n```\n\n"
+        yield "## File Documentation\n"
+        docs.seek(0)
+        yield from iter(lambda: docs.read(COPY_CHUNK), "")
+
+    def generate(self, out):
+        """Writes the structure document for the root directory to out."""
+        with tempfile.TemporaryFile('w+', encoding="utf-8") as docs:
+            out.writelines(self.chunks(docs))
+
+    def write(self, output_path=None):
+        """Writes the document to output_path, REPOSITORY_STRUCTURE.md in the root by default.
+
+        The new document replaces the old one atomically once it is complete.
+        """
+        output_path = Path(output_path) if output_path else self.root / OUTPUT_NAME
+        with atomic_open(output_path) as f:
+            self.generate(f)
+        return output_path
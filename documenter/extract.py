@@ -0,0 +1,115 @@
+import os
+from collections import namedtuple
+
+KOTLIN_JAVA_EXTENSIONS = {"kt", "java"}
+PYTHON_EXTENSIONS = {"py"}
+JAVASCRIPT_EXTENSIONS = {"js", "jsx", "ts", "tsx"}
+DOCUMENTED_EXTENSIONS = KOTLIN_JAVA_EXTENSIONS | PYTHON_EXTENSIONS | JAVASCRIPT_EXTENSIONS
+
+# max_size: files larger than this are listed as skipped instead of read.
+# prefix: prefix-based scans give up after this many bytes.
+Limits = namedtuple("Limits", "max_size prefix")
+DEFAULT_LIMITS = Limits(max_size=4 * 1024 * 1024, prefix=256 * 1024)
+
+def extension(name):
+    """Returns the extension of a file name the way VirtualFile.extension does."""
+    _, dot, ext = name.rpartition(".")
+    return ext if dot else ""
+
+def _read_text(path):
+    with open(path, 'rb') as f:
+        return f.read().decode("utf-8", errors="replace")
+
+def _format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def extract_python_docstring(text):
+    from documenter.scanner import python_docstring
+    doc = python_docstring(text)
+    return doc.strip() if doc is not None else ""
+
+def extract_python_docs(text, prefix=None):
+    """Returns the module docstring and the (label, docstring) pairs of its classes and functions.
+
+    Falls back to the leading triple-quoted string in the first prefix
+    characters, as the plugin does, for the module docstring when the
+    file does not parse.
+    """
+    # Imported on first use: runs answered from the DocCache never parse Python.
+    import ast
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return extract_python_docstring(text[:prefix]), []
+
+    definitions = []
+    pending = [(node, "") for node in reversed(tree.body)]
+    while pending:
+        node, parent = pending.pop()
+        if isinstance(node, ast.ClassDef):
+            kind = "class"
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            kind = "def"
+        else:
+            continue
+
+        qualname = f"{parent}.{node.name}" if parent else node.name
+        doc = ast.get_docstring(node)
+        if doc:
+            definitions.append((f"{kind} {qualname}", doc))
+        pending.extend((child, qualname) for child in reversed(node.body))
+
+    return ast.get_docstring(tree) or "", definitions
+
+def doc_lines(path, name, limits=DEFAULT_LIMITS):
+    """Returns the File Documentation lines for one file, or an empty list.
+
+    A file that cannot be read, such as a dangling symlink or one deleted
+    since it was listed, has none.
+    """
+    ext = extension(name)
+    if ext not in DOCUMENTED_EXTENSIONS:
+        return []
+    try:
+        return _doc_lines(path, name, ext, limits)
+    except OSError:
+        return []
+
+def _doc_lines(path, name, ext, limits):
+    size = os.stat(path).st_size
+    if size > limits.max_size:
+        limit = _format_size(limits.max_size)
+        return [f"\n#### {name}\n", f"_Skipped: {_format_size(size)} exceeds the {limit} extraction limit._\n"]
+
+    # Imported on first use, like ast: the scanners compile their patterns
+    # at import, which runs answered from the DocCache never need.
+    from documenter.reader import scan_prefix
+    from documenter.scanner import jsdoc, kotlin_java_docs
+
+    if ext in JAVASCRIPT_EXTENSIONS:
+        block = scan_prefix(path, jsdoc, limits.prefix)
+        doc = block.decode("utf-8", errors="replace").strip() if block is not None else ""
+        if not doc:
+            return []
+        return [f"\n#### {name}\n", f"{doc}\n"]
+
+    if ext in PYTHON_EXTENSIONS:
+        doc, definitions = extract_python_docs(_read_text(path), limits.prefix)
+        if not doc and not definitions:
+            return []
+    else:
+        # Kotlin and Java files are listed even without docs, as the plugin
+        # does. KDoc comments nest and Kotlin strings hold ${...}
+        # expressions; Java has neither.
+        kotlin = ext == "kt"
+        doc, definitions = kotlin_java_docs(_read_text(path), nested_comments=kotlin, string_templates=kotlin)
+    lines = [f"\n#### {name}\n"]
+    if doc:
+        lines.append(f"{doc}\n")
+    for label, definition_doc in definitions:
+        lines.append(f"\n##### `{label}`\n{definition_doc}\n")
+    return lines
@@ -0,0 +1,71 @@
+import os
+import subprocess
+
+class GitIndex:
+    """Finds changed paths inside a git work tree through the git binary.
+
+    changed_since() gives the paths that may differ from a recorded commit:
+    what git diff reports against it plus the untracked paths that are not
+    ignored. The snapshot index checks only the directories of those paths
+    instead of stat-ing every directory it knows. The listing itself still
+    comes from the disk walk, which streams entries in tree order with
+    flat memory; git's sorted path list would have to be held whole to
+    reorder it into that order.
+    """
+
+    def __init__(self, root):
+        self.root = os.fspath(root)
+
+    @classmethod
+    def open(cls, root):
+        """Returns a GitIndex for root, or None when git is missing or root is not in a work tree."""
+        index = cls(root)
+        try:
+            inside = index._git("rev-parse", "--is-inside-work-tree").strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return index if inside == b"true" else None
+
+    def _git(self, *args):
+        return subprocess.run(
+            ["git", "-C", self.root, *args],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+        ).stdout
+
+    def _split(self, output):
+        return [os.fsdecode(path) for path in output.split(b"\0") if path]
+
+    def head(self):
+        """Returns the commit checked out, or None before the first commit."""
+        try:
+            return self._git("rev-parse", "--verify", "-q", "HEAD").strip().decode("ascii") or None
+        except subprocess.CalledProcessError:
+            return None
+
+    def untracked(self):
+        """Returns the untracked paths that are not ignored.
+
+        A directory without tracked files is reported once, with a trailing
+        slash, so new empty directories show up too; everything below it
+        counts as changed.
+        """
+        return self._split(self._git("ls-files", "-z", "--others", "--exclude-standard", "--directory"))
+
+    def changed_since(self, commit):
+        """Returns the paths that may differ from commit, or None when commit is unknown.
+
+        That is every path git diff reports between commit and the work
+        tree, plus the untracked ones from untracked().
+        """
+        if not commit:
+            return None
+        try:
+            changed = self._split(self._git("diff", "--name-only", "--relative", "-z", commit))
+        except subprocess.CalledProcessError:
+            return None
+        return changed + self.untracked()
+
+    def dirty(self):
+        """Returns the paths that differ from HEAD: modified, staged, deleted and untracked ones."""
+        head = self.head()
+        return self.changed_since(head) if head else self.untracked()
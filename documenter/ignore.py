@@ -0,0 +1,193 @@
+import os
+import re
+
+IGNORE_FILE = ".gitignore"
+# Never documented, whatever the ignore files say.
+ALWAYS_IGNORED = {".git"}
+
+def _translate(pattern):
+    """Translates the glob part of a gitignore pattern into a regular expression."""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**", i):
+            before = i == 0 or pattern[i - 1] == "/"
+            after = i + 2 == n or pattern[i + 2] == "/"
+            if before and after:
+                if i + 2 == n:
+                    parts.append(".*")
+                else:
+                    parts.append("(?:.*/)?")
+                    i += 1
+                i += 2
+                continue
+            parts.append("[^/]*")
+            i += 2
+        elif c == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif c == "?":
+            parts.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body[:1] in ("!", "^"):
+                body = "^" + body[1:]
+            parts.append(f"(?!/)[{body}]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(c))
+            i += 1
+    return "".join(parts)
+
+def parse_line(line):
+    """Returns (regex, negate, dir_only) for one .gitignore line, or None for blanks and comments."""
+    line = line.rstrip("\n").rstrip("\r")
+    # Trailing spaces are ignored unless escaped.
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith(("\\#", "\\!")):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+
+    regex = _translate(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return regex, negate, dir_only
+
+class IgnoreRules:
+    """The patterns of one ignore file, compiled into a few combined regexes.
+
+    Consecutive patterns of the same polarity are joined into a single
+    alternation, once for directories and once for files (directory-only
+    patterns are left out of the latter). Runs are tried from the last to
+    the first, so the last matching pattern wins as in git.
+    """
+
+    def __init__(self, lines):
+        rules = [rule for rule in map(parse_line, lines) if rule is not None]
+        self.runs = []
+        start = 0
+        for index in range(1, len(rules) + 1):
+            if index == len(rules) or rules[index][1] != rules[start][1]:
+                run = rules[start:index]
+                self.runs.append((
+                    run[0][1],
+                    self._combine(regex for regex, _, _ in run),
+                    self._combine(regex for regex, _, dir_only in run if not dir_only)
+                ))
+                start = index
+        self.runs.reverse()
+
+    @staticmethod
+    def _combine(regexes):
+        regexes = list(regexes)
+        if not regexes:
+            return None
+        return re.compile("(?:" + "|".join(regexes) + r")\Z", re.DOTALL)
+
+    @classmethod
+    def read(cls, path):
+        """Reads an ignore file; returns None when it does not exist or has no patterns."""
+        try:
+            with open(path, 'r', encoding="utf-8", errors="replace") as f:
+                rules = cls(f)
+        except (FileNotFoundError, NotADirectoryError, PermissionError, IsADirectoryError):
+            return None
+        return rules if rules.runs else None
+
+    def match(self, relpath, is_dir):
+        """Returns True if relpath is ignored, False if re-included, None if no pattern matches."""
+        for negate, dirs, files in self.runs:
+            regex = dirs if is_dir else files
+            if regex is not None and regex.match(relpath):
+                return not negate
+        return None
+
+class IgnoreMatcher:
+    """Decides which entries below root a walk should prune.
+
+    Reads .gitignore in every directory it is asked about, plus the ones
+    above root up to the top of its work tree and .git/info/exclude
+    there, and keeps the chain of rule sets that
+    applies to each directory, so checking an entry costs one combined
+    regex match per ignore file above it. Ignored directories are meant to
+    be pruned before descending, so files below them are never checked.
+    """
+
+    def __init__(self, root):
+        self.root = os.fspath(root)
+        self._scopes = {}
+
+    def _outer_scope(self):
+        """Returns the rules of the ignore files above root, up to the top of its work tree.
+
+        Each is a (prefix, IgnoreRules) pair; prefix is the path from the
+        directory of the ignore file to root, which entry relpaths need in
+        front of them to be matched.
+        """
+        scope = []
+        directory = os.path.abspath(self.root)
+        prefix = ""
+        while not os.path.lexists(os.path.join(directory, ".git")):
+            parent, name = os.path.split(directory)
+            if parent == directory:
+                # Not in a work tree: only the root's own ignore files count.
+                return []
+            directory = parent
+            prefix = f"{name}/{prefix}"
+            rules = IgnoreRules.read(os.path.join(directory, IGNORE_FILE))
+            if rules is not None:
+                scope.append((prefix, rules))
+        exclude = IgnoreRules.read(os.path.join(directory, ".git", "info", "exclude"))
+        if exclude is not None:
+            scope.append((prefix, exclude))
+        return scope
+
+    def _scope(self, relpath):
+        """Returns the [(base relpath, prefix, IgnoreRules)] that apply inside a directory, innermost first."""
+        scope = self._scopes.get(relpath)
+        if scope is not None:
+            return scope
+        if relpath:
+            scope = self._scope(relpath.rpartition("/")[0])
+        else:
+            scope = [("", prefix, rules) for prefix, rules in self._outer_scope()]
+        rules = IgnoreRules.read(os.path.join(self.root, relpath, IGNORE_FILE))
+        if rules is not None:
+            # Directories without an ignore file share their parent's list.
+            scope = [(relpath, "", rules)] + scope
+        self._scopes[relpath] = scope
+        return scope
+
+    def ignored(self, parent, name, is_dir):
+        """Tells whether the entry name inside the directory parent (a relpath) is ignored."""
+        if name in ALWAYS_IGNORED:
+            return True
+        relpath = f"{parent}/{name}" if parent else name
+        for base, prefix, rules in self._scope(parent):
+            result = rules.match(prefix + (relpath[len(base) + 1:] if base else relpath), is_dir)
+            if result is not None:
+                return result
+        return False
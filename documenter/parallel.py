@@ -0,0 +1,74 @@
+import os
+from itertools import chain, repeat
+
+from documenter.extract import DEFAULT_LIMITS, DOCUMENTED_EXTENSIONS, doc_lines, extension
+
+def _extract_chunk(chunk, limits):
+    return [doc_lines(path, name, limits) for path, name in chunk]
+
+def _is_documented(entry):
+    return not entry.is_dir and extension(entry.name) in DOCUMENTED_EXTENSIONS
+
+class ParallelExtractor:
+    """Extracts file documentation on a process pool without changing document order.
+
+    Entries are taken from the walk in windows; the documented files of a
+    window are split into chunks, fanned out with ProcessPoolExecutor.map
+    and zipped back onto the window in their original order. Only one
+    window is in flight, so memory stays bounded on huge trees. With a
+    DocCache only the files it cannot answer are sent to the pool, which
+    is started on the first miss, so a fully cached run spawns no workers.
+    """
+
+    def __init__(self, workers=None, chunksize=64, limits=DEFAULT_LIMITS, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.limits = limits
+        self.cache = cache
+        self.window = self.workers * chunksize * 4
+        self._pool = None
+
+    def annotate(self, entries):
+        """Yields (entry, doc lines) pairs in the order the entries came in."""
+        try:
+            batch = []
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) >= self.window:
+                    yield from self._annotate_batch(batch)
+                    batch = []
+            yield from self._annotate_batch(batch)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Imported here: concurrent.futures is the slowest import of a documenter run.
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _annotate_batch(self, batch):
+        cached = {}
+        if self.cache is not None:
+            for index, entry in enumerate(batch):
+                if _is_documented(entry):
+                    lines = self.cache.lookup(entry.path, entry.name, self.limits)
+                    if lines is not None:
+                        cached[index] = lines
+
+        jobs = [(entry.path, entry.name) for index, entry in enumerate(batch)
+                if _is_documented(entry) and index not in cached]
+        chunks = [jobs[start:start + self.chunksize] for start in range(0, len(jobs), self.chunksize)]
+        results = chain.from_iterable(self._get_pool().map(_extract_chunk, chunks, repeat(self.limits))) if chunks else iter(())
+        for index, entry in enumerate(batch):
+            if not _is_documented(entry):
+                yield entry, ()
+            elif index in cached:
+                yield entry, cached[index]
+            elif self.cache is not None:
+                yield entry, self.cache.store(entry.path, entry.name, self.limits, next(results))
+            else:
+                yield entry, next(results)
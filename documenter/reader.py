@@ -0,0 +1,21 @@
+import mmap
+import os
+
+def _mapped(f):
+    if os.fstat(f.fileno()).st_size == 0:
+        return None
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def scan_prefix(path, scanner, prefix):
+    """Returns scanner(data, end) for the file mapped into memory, or None for an empty file.
+
+    end is the smaller of the file size and prefix. The scanner works on
+    the mmap directly, so nothing past where it stops is ever paged in and
+    only what it returns is copied.
+    """
+    with open(path, 'rb') as f:
+        mm = _mapped(f)
+        if mm is None:
+            return None
+        with mm:
+            return scanner(mm, min(len(mm), prefix))
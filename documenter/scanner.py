@@ -0,0 +1,387 @@
+import re
+
+BACKSLASH = 0x5C
+
+# Every pattern here is a set of fixed alternatives, so a search can only
+# move forward: no input makes the scanners look at a byte twice (apart
+# from counting the backslashes in front of a quote once).
+_WHITESPACE = re.compile(r"\s*")
+_JS_TOKEN = re.compile(rb"/[*/]|[\"'`]")
+_JS_STRING_END = {
+    b"'": re.compile(rb"['\n]"),
+    b'"': re.compile(rb'["\n]'),
+    # Template literals may span lines.
+    b"`": re.compile(rb"`"),
+}
+
+def _escaped(data, index, start):
+    """Tells whether data[index] is preceded by an odd number of backslashes after start."""
+    count = 0
+    while index - count > start and data[index - count - 1] in (BACKSLASH, "\\"):
+        count += 1
+    return count % 2 == 1
+
+def python_docstring(text):
+    """Returns the body of the triple-quoted string that opens text, or None.
+
+    Only whitespace may come before it, as in the plugin's pattern, but the
+    closer has to be the kind of triple quote that opened the string and
+    backslash-escaped quotes do not close it. Runs in one pass over text.
+    """
+    start = _WHITESPACE.match(text).end()
+    quote = text[start:start + 3]
+    if quote != '"""' and quote != "'''":
+        return None
+    position = start + 3
+    while True:
+        close = text.find(quote, position)
+        if close == -1:
+            return None
+        if not _escaped(text, close, position):
+            return text[start + 3:close]
+        position = close + 1
+
+def _skip_string(data, position, end, quote):
+    """Returns the index after the string whose body starts at position.
+
+    Quoted strings end at an unescaped newline, which is a syntax error in
+    JavaScript; resuming there keeps a stray quote from hiding the rest of
+    the file. An unterminated string runs to end.
+    """
+    pattern = _JS_STRING_END[quote]
+    while True:
+        match = pattern.search(data, position, end)
+        if match is None:
+            return end
+        index = match.start()
+        if not _escaped(data, index, position):
+            return index + 1
+        position = index + 1
+
+def jsdoc(data, end=None):
+    """Returns the body of the first /** ... */ comment in data[:end], or None.
+
+    data is bytes or an mmap. Strings, template literals, line comments and
+    plain block comments are skipped, so a "/**" inside them does not
+    count, and "/**/" is an empty plain comment rather than a doc comment.
+    Each byte is visited once.
+    """
+    end = len(data) if end is None else min(end, len(data))
+    position = 0
+    while True:
+        match = _JS_TOKEN.search(data, position, end)
+        if match is None:
+            return None
+        token = match.group()
+        start = match.end()
+        if token == b"//":
+            newline = data.find(b"\n", start, end)
+            if newline == -1:
+                return None
+            position = newline + 1
+        elif token == b"/*":
+            close = data.find(b"*/", start, end)
+            if close == -1:
+                return None
+            if close > start and data[start] == ord("*"):
+                return bytes(data[start + 1:close])
+            position = close + 2
+        else:
+            position = _skip_string(data, start, end, token)
+
+# Kotlin and Java. The main pass only stops at what changes the nesting of
+# declarations or hides code (comments, strings, braces, declaration
+# keywords); the few tokens after a doc comment are read one by one to see
+# what it documents.
+_KJ_TOKEN = re.compile(r"""/\*\*?|//|\"\"\"|["';]|\{+|\}+|\b(?:class|interface|object|enum|record|fun)\b""")
+# Annotations include a use-site target such as @get:JvmName.
+_KJ_HEADER = re.compile(
+    r"""\s*(/\*\*?|//|@file\s*:|@[A-Za-z_$][\w$.]*(?:\s*:\s*[A-Za-z_$][\w$.]*)?|[A-Za-z_$][\w$]*|`[^`\n]+`|\"\"\"|\S)"""
+)
+_KJ_COMMENT = re.compile(r"/\*|\*/")
+_KJ_PARENS = re.compile(r"""/\*\*?|//|\"\"\"|["'()]""")
+_KJ_STRING_END = {'"': re.compile(r'["\n]'), "'": re.compile(r"['\n]"), '"""': re.compile(r'"""')}
+# Kotlin strings also stop at a template expression, whose body is code.
+_KT_STRING_END = {'"': re.compile(r'["\n]|\$\{'), '"""': re.compile(r'"""|\$\{')}
+_KT_TEMPLATE = re.compile(r"""\"\"\"|["'{}]|/[*/]""")
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*|`[^`\n]+`")
+
+CLASS_KEYWORDS = {"class", "interface", "object", "enum", "record"}
+# Declarations that are neither classes nor functions.
+OTHER_DECLARATIONS = {"val", "var", "typealias", "constructor", "init"}
+MODIFIERS = {
+    "public", "protected", "private", "internal", "static", "final", "abstract", "open", "sealed", "data",
+    "inner", "companion", "override", "suspend", "inline", "infix", "operator", "tailrec", "external",
+    "const", "lateinit", "annotation", "value", "expect", "actual", "synchronized", "native", "strictfp",
+    "transient", "volatile", "default", "non-sealed", "crossinline", "noinline", "reified"
+}
+
+def _comment_end(text, position, nested):
+    """Returns the index after the block comment whose body starts at position.
+
+    Kotlin block comments nest, Java ones do not. An unterminated comment
+    runs to the end of text.
+    """
+    depth = 1
+    while True:
+        match = _KJ_COMMENT.search(text, position)
+        if match is None:
+            return len(text)
+        position = match.end()
+        if match.group() == "*/":
+            depth -= 1
+            if depth == 0:
+                return position
+        elif nested:
+            depth += 1
+
+def _kj_string_end(text, position, quote, templates=False):
+    """Returns the index after the string or char literal whose body starts at position.
+
+    With templates (Kotlin), the ${...} expressions in "..." and raw
+    strings are skipped as code, nested strings and braces included, so a
+    quote or brace inside one neither ends the string nor counts as a
+    brace of the enclosing code. Open strings and expressions are kept on
+    a stack rather than the call stack, so deep nesting cannot overflow.
+    """
+    # [(quote, start of its body)]; "{" for an expression or a brace in one.
+    stack = [(quote, position)]
+    while True:
+        context, start = stack[-1]
+        if context == "{":
+            match = _KT_TEMPLATE.search(text, position)
+            if match is None:
+                return len(text)
+            token = match.group()
+            position = match.end()
+            if token == "}":
+                stack.pop()
+            elif token == "{":
+                stack.append((token, position))
+            elif token == "//":
+                newline = text.find("\n", position)
+                position = len(text) if newline == -1 else newline + 1
+            elif token == "/*":
+                position = _comment_end(text, position, True)
+            elif token == "'":
+                position = _kj_string_end(text, position, token)
+            else:
+                stack.append((token, position))
+            continue
+
+        pattern = (_KT_STRING_END if templates and context != "'" else _KJ_STRING_END)[context]
+        match = pattern.search(text, position)
+        if match is None:
+            return len(text)
+        index = match.start()
+        position = index + 1
+        if _escaped(text, index, start):
+            continue
+        if match.group() == "${":
+            position = match.end()
+            stack.append(("{", position))
+            continue
+        if context == '"""':
+            # Kotlin raw strings and Java text blocks; a raw string may end in
+            # extra quotes that belong to its content.
+            position = index + 3
+            while text.startswith('"', position):
+                position += 1
+        stack.pop()
+        if not stack:
+            return position
+
+def _parens_end(text, position, nested, templates):
+    """Returns the index after the parenthesized group that opens at position.
+
+    Returns None when a doc comment comes first: the group is unclosed or
+    holds one, and either way the main pass takes over from there. So the
+    lookahead after one doc comment never runs past the next, and the
+    scan stays linear however the parentheses nest.
+    """
+    depth = 0
+    while True:
+        match = _KJ_PARENS.search(text, position)
+        if match is None:
+            return len(text)
+        token = match.group()
+        position = match.end()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+            if depth == 0:
+                return position
+        elif token == "/**":
+            return None
+        elif token == "/*":
+            position = _comment_end(text, position, nested)
+        elif token == "//":
+            newline = text.find("\n", position)
+            position = len(text) if newline == -1 else newline + 1
+        else:
+            position = _kj_string_end(text, position, token, templates)
+
+def _skip_space(text, position):
+    return _WHITESPACE.match(text, position).end()
+
+def _next_name(text, position):
+    """Returns the identifier after position, skipping whitespace, or None."""
+    match = _IDENTIFIER.match(text, _skip_space(text, position))
+    return match.group().strip("`") if match else None
+
+def _class_name(text, position, keyword):
+    """Returns the name declared after a class keyword that ends at position, or None."""
+    name = _next_name(text, position)
+    if keyword == "enum" and name == "class":
+        name = _next_name(text, _skip_space(text, position) + len("class"))
+    return name
+
+def clean_doc_comment(body):
+    """Strips the leading asterisks and indentation from the lines of a doc comment body."""
+    lines = []
+    for line in body.splitlines():
+        line = line.strip()
+        if line.startswith("*"):
+            line = line[1:]
+            if line.startswith(" "):
+                line = line[1:]
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+def _declaration(text, position, nested, templates):
+    """Tells what a doc comment ending at position documents.
+
+    Returns ("file", None) for a package or import statement or a file
+    annotation, (kind, name) for a class-like declaration ("class",
+    "interface", "object", "enum", "record" or "@interface"), ("fun", name)
+    for a Kotlin function, ("method", name) for a Java method or
+    constructor, or None for anything else.
+    """
+    last_word = None
+    after_fun = False
+    companion = False
+    while True:
+        match = _KJ_HEADER.match(text, position)
+        if match is None:
+            return None
+        token = match.group(1)
+        position = match.end()
+        if token == "/**":
+            # Another doc comment follows; this one documents nothing.
+            return None
+        if token == "/*":
+            position = _comment_end(text, position, nested)
+        elif token == "//":
+            newline = text.find("\n", position)
+            position = len(text) if newline == -1 else newline + 1
+        elif token.startswith("@file"):
+            return "file", None
+        elif token == "@interface":
+            return token, _next_name(text, position)
+        elif token[0] == "@":
+            # An annotation, with or without arguments.
+            rest = _skip_space(text, position)
+            if text.startswith("(", rest):
+                position = _parens_end(text, rest, nested, templates)
+                if position is None:
+                    return None
+        elif token in ("package", "import") and last_word is None:
+            return "file", None
+        elif token in CLASS_KEYWORDS and (last_word is None or (after_fun and not last_word)):
+            # "fun interface" declares an interface too.
+            name = _class_name(text, position, token)
+            if token == "object" and name is None and companion:
+                name = "Companion"
+            return token, name
+        elif token in OTHER_DECLARATIONS and last_word is None:
+            return None
+        elif token == "fun" and last_word is None:
+            after_fun = True
+            last_word = ""
+        elif token in MODIFIERS and last_word is None:
+            companion = companion or token == "companion"
+        elif token[0].isalpha() or token[0] in "_$`":
+            last_word = token.strip("`")
+        elif token == "(":
+            if last_word:
+                return ("fun" if after_fun else "method"), last_word
+            return None
+        elif token in ("{", "}", ";", "=", '"', "'", '"""'):
+            return None
+        # <, >, ., ?, ,, :, [ and ] are part of types and receivers.
+
+def kotlin_java_docs(text, nested_comments=True, string_templates=True):
+    """Returns the file doc comment and the (label, doc) pairs of the classes and functions in text.
+
+    A single pass over the source skips strings, char literals, raw
+    strings and comments (nested ones when nested_comments is set, and
+    ${...} expressions inside strings when string_templates is set, as in
+    Kotlin) and follows braces, so labels carry the enclosing classes, e.g.
+    "fun Outer.Inner.run". A doc comment before the package statement,
+    the imports or a file annotation is the file doc.
+    """
+    file_doc = ""
+    definitions = []
+    # [(class name, brace depth of its body)]
+    scopes = []
+    depth = 0
+    pending = None
+    declared = False
+    position = 0
+    while True:
+        match = _KJ_TOKEN.search(text, position)
+        if match is None:
+            return file_doc, definitions
+        token = match.group()
+        position = match.end()
+
+        if token == "/**" and text.startswith("/", position):
+            # The empty comment "/**/".
+            position += 1
+        elif token == "/**":
+            end = _comment_end(text, position, nested_comments)
+            doc = clean_doc_comment(text[position:end - 2] if text.endswith("*/", 0, end) else text[position:end])
+            declaration = _declaration(text, end, nested_comments, string_templates) if doc else None
+            position = end
+            if declaration is None:
+                continue
+            kind, name = declaration
+            if kind == "file":
+                if not declared and not file_doc and not definitions:
+                    file_doc = doc
+            elif name:
+                qualified = ".".join([scope for scope, _ in scopes] + [name])
+                definitions.append((f"{kind} {qualified}", doc))
+        elif token[0] == "/":
+            if token == "//":
+                newline = text.find("\n", position)
+                position = len(text) if newline == -1 else newline + 1
+            else:
+                position = _comment_end(text, position, nested_comments)
+        elif token in ('"', "'", '"""'):
+            position = _kj_string_end(text, position, token, string_templates)
+        elif token[0] == "{":
+            if pending is not None:
+                scopes.append((pending, depth + 1))
+                pending = None
+            depth += len(token)
+        elif token[0] == "}":
+            depth = max(depth - len(token), 0)
+            while scopes and scopes[-1][1] > depth:
+                scopes.pop()
+        elif token == ";" or token == "fun":
+            pending = None
+            declared = declared or token == "fun"
+        else:
+            declared = True
+            before = match.start()
+            while before > 0 and text[before - 1].isspace():
+                before -= 1
+            if text.startswith((".", ":"), before - 1):
+                # Foo.class or Foo::class
+                continue
+            name = _class_name(text, position, token)
+            if token == "object" and name is None and text.endswith("companion", 0, before):
+                name = "Companion"
+            pending = name
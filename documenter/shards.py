@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from documenter.atomic import atomic_open
+from documenter.cache import cache_dir
+from documenter.engine import COPY_CHUNK, OUTPUT_NAME
+from documenter.walker import tree_line
+
+INDENT = 4
+
+def _link(relpath, base):
+    """Returns the relative link from the shard of base to the shard of relpath."""
+    target = os.path.join(relpath, OUTPUT_NAME) if relpath else OUTPUT_NAME
+    return os.path.relpath(target, base or ".").replace(os.sep, "/")
+
+class _Shard:
+    """One shard being assembled: its tree lines and docs are spooled to temporary files."""
+
+    def __init__(self, relpath, depth):
+        self.relpath = relpath
+        self.depth = depth
+        self.tree = tempfile.TemporaryFile('w+', encoding="utf-8")
+        self.docs = tempfile.TemporaryFile('w+', encoding="utf-8")
+        self.children = []
+        if relpath:
+            self.docs.write(f"\n### {relpath}\n")
+
+    def contains(self, relpath):
+        return not self.relpath or relpath.startswith(self.relpath + "/")
+
+    def body(self, shards=()):
+        """Yields the shard's text after the header."""
+        if self.relpath:
+            parent = self.relpath.rpartition("/")[0]
+            yield f"[Up]({_link(parent, self.relpath)})\n\n"
+        yield "## Directory Structure\n```\n"
+        self.tree.seek(0)
+        yield from iter(lambda: self.tree.read(COPY_CHUNK), "")
+        yield "```\n\n"
+        if self.children:
+            yield "## Subdirectory Structure\n"
+            yield from (f"- [{child}]({_link(child, self.relpath)})\n" for child in self.children)
+            yield "\n"
+        if shards:
+            yield "## All Shards\n"
+            for relpath in shards:
+                indent = "  " * relpath.count("/")
+                yield f"{indent}- [{relpath.rpartition('/')[2]}]({_link(relpath, self.relpath)})\n"
+            yield "\n"
+        yield "## File Documentation\n"
+        self.docs.seek(0)
+        yield from iter(lambda: self.docs.read(COPY_CHUNK), "")
+
+    def close(self):
+        self.tree.close()
+        self.docs.close()
+
+class ShardWriter:
+    """Splits a StructureDocumenter's output into one document per directory.
+
+    Every directory up to depth levels below the root gets its own
+    REPOSITORY_STRUCTURE.md; shards above the last level list their direct
+    contents and link to the shards of their subdirectories, shards at the
+    last level cover their whole subtree, and the root document doubles as
+    an index of all shards. The entries are read in one pass with only the
+    shards on the current path open. A digest of each shard's text (without
+    its timestamp) is kept in the cache directory, so a change only
+    rewrites the shards whose content it altered, which are the ones on its
+    path; shards that no longer exist are removed.
+    """
+
+    def __init__(self, documenter, depth=1, digest_path=None):
+        self.documenter = documenter
+        self.root = documenter.root
+        self.depth = depth
+        self.digest_path = digest_path or cache_dir(self.root) / "shards.json"
+        self.written = []
+        self.unchanged = 0
+
+    def _load_digests(self):
+        try:
+            with open(self.digest_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_digests(self, digests):
+        with atomic_open(self.digest_path) as f:
+            json.dump(digests, f, indent=2, sort_keys=True)
+
+    def _output_path(self, relpath):
+        return self.root / relpath / OUTPUT_NAME if relpath else self.root / OUTPUT_NAME
+
+    def _finish(self, shard, previous, digests, shards=()):
+        digest = hashlib.sha256()
+        for chunk in shard.body(shards):
+            digest.update(chunk.encode("utf-8"))
+        digest = digest.hexdigest()
+        digests[shard.relpath] = digest
+        output_path = self._output_path(shard.relpath)
+
+        if previous.get(shard.relpath) == digest and output_path.exists():
+            self.unchanged += 1
+        else:
+            title = shard.relpath or self.root.resolve().name.upper()
+            with atomic_open(output_path) as f:
+                f.write(f"# {title} Structure\nLast updated: {datetime.now().isoformat()}\n\n")
+                f.writelines(shard.body(shards))
+            self.written.append(output_path)
+        shard.close()
+
+    def _is_shard(self, entry, depth):
+        return entry.is_dir and entry.path is not None and depth <= self.depth and not os.path.islink(entry.path)
+
+    def write(self):
+        """Writes every shard whose content changed and returns the paths written."""
+        previous = self._load_digests()
+        digests = {}
+        shards = []
+        stack = [_Shard("", 0)]
+        try:
+            for entry, lines in self.documenter.entries():
+                while not stack[-1].contains(entry.relpath):
+                    self._finish(stack.pop(), previous, digests)
+                shard = stack[-1]
+                line = tree_line(entry._replace(prefix=entry.prefix[INDENT * shard.depth:]))
+                depth = entry.relpath.count("/") + 1
+
+                if self._is_shard(entry, depth):
+                    shard.tree.write(f"{line[:-1]}/ (see {_link(entry.relpath, shard.relpath)})\n")
+                    shard.children.append(entry.relpath)
+                    shards.append(entry.relpath)
+                    stack.append(_Shard(entry.relpath, depth))
+                    continue
+
+                shard.tree.write(line)
+                if entry.is_dir:
+                    shard.docs.write(f"\n### {entry.relpath}\n")
+                else:
+                    shard.docs.writelines(lines)
+
+            while len(stack) > 1:
+                self._finish(stack.pop(), previous, digests)
+            self._finish(stack.pop(), previous, digests, shards)
+        finally:
+            for shard in stack:
+                shard.close()
+
+        for relpath in previous.keys() - digests.keys():
+            try:
+                os.unlink(self._output_path(relpath))
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+        self._save_digests(digests)
+        return self.written
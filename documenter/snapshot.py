@@ -0,0 +1,244 @@
+import os
+import pickle
+from collections import namedtuple
+from pathlib import Path
+
+from documenter.cache import cache_dir
+from documenter.extract import DEFAULT_LIMITS, DOCUMENTED_EXTENSIONS, doc_lines, extension
+from documenter.ignore import IGNORE_FILE, IgnoreMatcher
+from documenter.tree import DIRECTORY, FILE, LINKED_DIRECTORY, Listing
+from documenter.walker import Entry, hidden_marker, list_children
+
+SNAPSHOT_VERSION = 10
+
+# children: Listing of the entries in tree order
+# docs: {file name: (mtime_ns, size, doc lines)} for documented files
+# hidden: number of entries pruned by ignore files
+# ignore_stat: (mtime_ns, size) of the directory's .gitignore, or None
+DirRecord = namedtuple("DirRecord", "inode mtime_ns size children docs hidden ignore_stat")
+
+def _file_stat(path):
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class SnapshotIndex:
+    """Persisted per-directory snapshot of a documented tree.
+
+    For every directory the index stores its (inode, mtime, size), its sorted
+    listing and the documentation lines of its source files. A later run
+    stats the recorded directories, rescans only those whose stat changed and
+    re-extracts only files whose own mtime or size moved; the document is
+    then re-emitted from the stored fragments without walking the disk.
+    Passing the paths known to have changed (from a watcher or git) limits
+    the stat calls to those directories. With gitignore set, ignored entries
+    are pruned as in walk(); editing an ignore file rescans the directories
+    it governs. A DocCache, if given, serves files the index has not seen.
+    """
+
+    def __init__(self, root: Path, index_path=None, limits=DEFAULT_LIMITS, gitignore=True, cache=None):
+        self.root = Path(root)
+        self.limits = limits
+        self.gitignore = gitignore
+        self.cache = cache
+        self.index_path = Path(index_path) if index_path else cache_dir(self.root) / "snapshot.pickle"
+        self.records = {}
+        self.exclude_stat = None
+        # The git commit the index was last brought up to date with, if any,
+        # and the paths that differed from it then (modified or untracked).
+        # Those have to be checked again even when git no longer reports
+        # them: a deleted untracked file or a reverted edit.
+        self.commit = None
+        self.dirty = []
+
+    def load(self):
+        """Loads the persisted index; a missing or outdated one leaves it empty."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                version, root, gitignore, exclude_stat, commit, dirty, records = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError):
+            return self
+        if (version, root, gitignore) == (SNAPSHOT_VERSION, str(self.root.resolve()), self.gitignore):
+            self.records = records
+            self.exclude_stat = exclude_stat
+            self.commit = commit
+            self.dirty = dirty
+        return self
+
+    def save(self):
+        """Persists the index, replacing the previous one atomically."""
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            snapshot = (SNAPSHOT_VERSION, str(self.root.resolve()), self.gitignore, self.exclude_stat, self.commit,
+                        self.dirty, self.records)
+            pickle.dump(snapshot, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.index_path)
+
+    def _path(self, relpath):
+        return os.path.join(self.root, relpath) if relpath else os.fspath(self.root)
+
+    def _relpath(self, path):
+        path = Path(path)
+        if not path.is_absolute():
+            relpath = path.as_posix()
+            return "" if relpath == "." else relpath
+        relpath = path.resolve().relative_to(self.root.resolve()).as_posix()
+        return "" if relpath == "." else relpath
+
+    def _ignore_stat(self, relpath):
+        return _file_stat(os.path.join(self._path(relpath), IGNORE_FILE)) if self.gitignore else None
+
+    def _scan(self, relpath, previous, ignore):
+        """Lists one directory and returns the relpaths of its subdirectories to descend into."""
+        path = self._path(relpath)
+        stat = os.stat(path)
+        old_docs = previous.docs if previous else {}
+        children = []
+        docs = {}
+        subdirs = []
+        listing, hidden = list_children(path, relpath, ignore)
+        for entry, is_dir in listing:
+            if not is_dir:
+                children.append((entry.name, FILE))
+                if extension(entry.name) in DOCUMENTED_EXTENSIONS:
+                    docs[entry.name] = self._doc(entry.path, entry.name, old_docs.get(entry.name))
+            elif entry.is_symlink():
+                children.append((entry.name, LINKED_DIRECTORY))
+            else:
+                children.append((entry.name, DIRECTORY))
+                subdirs.append(f"{relpath}/{entry.name}" if relpath else entry.name)
+
+        self.records[relpath] = DirRecord(stat.st_ino, stat.st_mtime_ns, stat.st_size, Listing.build(children),
+                                          docs, hidden, self._ignore_stat(relpath))
+        return subdirs
+
+    def _doc(self, path, name, previous):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (0, 0, ())
+        if previous is not None and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+            return previous
+        extract = self.cache.lines if self.cache is not None else doc_lines
+        return (stat.st_mtime_ns, stat.st_size, tuple(extract(path, name, self.limits)))
+
+    def _subtree(self, relpath):
+        prefix = f"{relpath}/"
+        return [key for key in self.records if not relpath or key == relpath or key.startswith(prefix)]
+
+    def _scan_tree(self, relpath, ignore):
+        """Rescans a directory and everything below it, reusing the docs of unchanged files."""
+        previous = {key: self.records.pop(key) for key in self._subtree(relpath)}
+        scanned = []
+        pending = [relpath]
+        while pending:
+            current = pending.pop()
+            scanned.append(current)
+            pending.extend(reversed(self._scan(current, previous.get(current), ignore)))
+        return scanned
+
+    def _drop_tree(self, relpath):
+        for key in self._subtree(relpath):
+            del self.records[key]
+
+    def _refresh_docs(self, relpath, record):
+        docs = {name: self._doc(self._path(f"{relpath}/{name}" if relpath else name), name, doc)
+                for name, doc in record.docs.items()}
+        if docs != record.docs:
+            self.records[relpath] = record._replace(docs=docs)
+
+    def update(self, changed=None):
+        """Brings the index in line with the disk and returns the rescanned directories.
+
+        changed optionally lists paths (files or directories, absolute or
+        relative to the root) known to have changed; only those directories
+        and the directories above them are checked. A path with a trailing
+        slash stands for its whole subtree, as git reports untracked
+        directories.
+        """
+        ignore = IgnoreMatcher(self.root) if self.gitignore else None
+        exclude_stat = _file_stat(self.root / ".git" / "info" / "exclude") if self.gitignore else None
+        if "" not in self.records or exclude_stat != self.exclude_stat:
+            self.exclude_stat = exclude_stat
+            self._scan_tree("", ignore)
+            return sorted(self.records)
+
+        if changed is None:
+            candidates = list(self.records)
+        else:
+            candidates = set()
+            for path in changed:
+                relpath = self._relpath(path)
+                if os.fspath(path).endswith("/"):
+                    candidates.update(self._subtree(relpath))
+                elif relpath in self.records:
+                    candidates.add(relpath)
+                # Ancestors too, so directories created below a known one are found.
+                while relpath:
+                    relpath = relpath.rpartition("/")[0]
+                    candidates.add(relpath)
+
+        rescanned = []
+        for relpath in sorted(candidates):
+            record = self.records.get(relpath)
+            if record is None:
+                continue
+            try:
+                stat = os.stat(self._path(relpath))
+            except FileNotFoundError:
+                # The parent's listing changed as well and drops this subtree.
+                continue
+
+            if self._ignore_stat(relpath) != record.ignore_stat:
+                # The rules for the whole subtree changed.
+                rescanned.extend(self._scan_tree(relpath, ignore))
+                continue
+
+            if (stat.st_ino, stat.st_mtime_ns, stat.st_size) == (record.inode, record.mtime_ns, record.size):
+                self._refresh_docs(relpath, record)
+                continue
+
+            old_subdirs = set(record.children.subdirs())
+            subdirs = self._scan(relpath, record, ignore)
+            rescanned.append(relpath)
+            new_names = {subdir.rpartition("/")[2] for subdir in subdirs}
+            for name in old_subdirs - new_names:
+                self._drop_tree(f"{relpath}/{name}" if relpath else name)
+            for subdir in subdirs:
+                if subdir not in self.records:
+                    rescanned.extend(self._scan_tree(subdir, ignore))
+        return rescanned
+
+    def iter_entries(self):
+        """Yields (entry, doc lines) pairs in document order from the stored fragments."""
+        stack = [(self._listing(""), "", "")]
+        while stack:
+            children, prefix, parent = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                continue
+
+            name, kind, is_last, docs = child
+            relpath = f"{parent}/{name}" if parent else name
+            if docs is None:
+                # The marker for entries pruned by ignore files.
+                yield Entry(None, relpath, name, False, prefix, is_last), ()
+                continue
+            entry = Entry(self._path(relpath), relpath, name, kind != FILE, prefix, is_last)
+            yield entry, docs.get(name, (0, 0, ()))[2] if kind == FILE else ()
+
+            if kind == DIRECTORY:
+                stack.append((self._listing(relpath), prefix + ("    " if is_last else "│   "), relpath))
+
+    def _listing(self, relpath):
+        record = self.records.get(relpath)
+        if record is None:
+            return
+        last = len(record.children) - 1 if not record.hidden else len(record.children)
+        for index, (name, kind) in enumerate(record.children):
+            yield name, kind, index == last, record.docs
+        if record.hidden:
+            yield hidden_marker(record.hidden), FILE, True, None
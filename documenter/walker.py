@@ -0,0 +1,71 @@
+import os
+from collections import namedtuple
+
+from documenter.atomic import is_temporary
+
+OUTPUT_NAME = "REPOSITORY_STRUCTURE.md"
+
+Entry = namedtuple("Entry", "path relpath name is_dir prefix is_last")
+
+def list_children(path, relpath="", ignore=None):
+    """Lists one directory ordered like the IDE plugin: directories first, then by name.
+
+    Returns ([(DirEntry, is_dir)], hidden count): entries an IgnoreMatcher
+    rejects (relpath being the directory's own relpath) are dropped and
+    counted; the generated documents themselves and half-written files from
+    atomic_open are dropped silently, so regenerating never changes the tree.
+    """
+    try:
+        with os.scandir(path) as it:
+            children = sorted(((not child.is_dir(), child.name, child) for child in it
+                               if child.name != OUTPUT_NAME and not is_temporary(child.name)),
+                              key=lambda item: item[:2])
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        return [], 0
+
+    if ignore is None:
+        return [(child, not is_file) for is_file, _, child in children], 0
+    visible = [(child, not is_file) for is_file, name, child in children if not ignore.ignored(relpath, name, not is_file)]
+    return visible, len(children) - len(visible)
+
+def hidden_marker(count):
+    """Returns the tree line name that stands in for pruned entries."""
+    return f"… {count} {'entry' if count == 1 else 'entries'} hidden"
+
+def _listing(path, relpath, ignore):
+    children, hidden = list_children(path, relpath, ignore)
+    last = len(children) - 1 if not hidden else len(children)
+    for index, (child, is_dir) in enumerate(children):
+        yield child.path, child.name, is_dir, not child.is_symlink(), index == last
+    if hidden:
+        yield None, hidden_marker(hidden), False, False, True
+
+def walk(root, ignore=None):
+    """Yields every entry below root depth-first in tree order.
+
+    Only the listings of the directories on the current path are held at any
+    time, so memory grows with depth and breadth but not with the size of
+    the tree. Symlinked directories are listed but not descended into.
+    Entries an IgnoreMatcher rejects are pruned before they are descended
+    into; each directory that lost entries ends with a marker entry whose
+    path is None.
+    """
+    stack = [(_listing(root, "", ignore), "", "")]
+    while stack:
+        children, prefix, parent = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            continue
+
+        path, name, is_dir, descend, is_last = child
+        relpath = f"{parent}/{name}" if parent else name
+        yield Entry(path, relpath, name, is_dir, prefix, is_last)
+
+        if is_dir and descend:
+            stack.append((_listing(path, relpath, ignore), prefix + ("    " if is_last else "│   "), relpath))
+
+def tree_line(entry):
+    """Formats an entry as one line of the directory tree."""
+    connector = "└── " if entry.is_last else "├── "
+    return f"{entry.prefix}{connector}{entry.name}\n"
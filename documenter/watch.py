@@ -0,0 +1,305 @@
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from documenter.atomic import is_temporary
+from documenter.engine import OUTPUT_NAME
+from documenter.ignore import ALWAYS_IGNORED, IGNORE_FILE, IgnoreMatcher
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+def _relpath(root, path):
+    return os.path.relpath(path, root).replace(os.sep, "/") if path != root else ""
+
+def _directories(root, ignore=None, start=None):
+    """Yields start (root by default) and the directories below it that a walk would descend into.
+
+    .git is always skipped, and so is whatever an IgnoreMatcher for root
+    rejects, so build outputs and dependency trees are never watched.
+    """
+    start = start or root
+    pending = [(start, _relpath(root, start))]
+    while pending:
+        path, relpath = pending.pop()
+        yield path
+        try:
+            with os.scandir(path) as it:
+                pending.extend(
+                    (entry.path, f"{relpath}/{entry.name}" if relpath else entry.name) for entry in it
+                    if entry.is_dir(follow_symlinks=False) and not _pruned(ignore, relpath, entry.name)
+                )
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+
+def _root_of(roots, path):
+    """Returns the innermost of roots containing path, or None; roots may be nested."""
+    return max((root for root in roots if path == root or path.startswith(root + os.sep)), key=len, default=None)
+
+def _pruned(ignore, parent, name):
+    if ignore is None:
+        return name in ALWAYS_IGNORED
+    return ignore.ignored(parent, name, True)
+
+class InotifyWatcher:
+    """Reports changed paths below a set of roots through Linux inotify.
+
+    inotify is bound through ctypes and watches are added for every
+    directory, including ones created while running, except those the
+    ignore files prune (unless gitignore is False) and .git. Editing an
+    ignore file re-reads the rules and watches what they no longer prune.
+    Raises OSError when inotify is unavailable or the watch limit is hit,
+    so callers can fall back to PollingWatcher.
+    """
+
+    def __init__(self, roots, gitignore=True):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.gitignore = gitignore
+        self._ignores = {root: IgnoreMatcher(root) if gitignore else None for root in self.roots}
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths = {}
+        for root in self.roots:
+            self._watch_tree(root)
+
+    def _root_of(self, path):
+        return _root_of(self.roots, path)
+
+    def _watch_tree(self, root, start=None):
+        for path in _directories(root, self._ignores[root], start):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if errno in (2, 20):  # ENOENT, ENOTDIR: gone before we got to it
+                    continue
+                raise OSError(errno, f"inotify_add_watch failed for {path}: {os.strerror(errno)}")
+            self._paths[wd] = path
+
+    def poll(self, timeout=None):
+        """Waits up to timeout seconds and returns the set of changed paths."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        reload = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; report the roots so they are rescanned in full.
+                    changed.update(self.roots)
+                    continue
+                directory = self._paths.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._paths[wd]
+                    continue
+
+                path = os.path.join(directory, os.fsdecode(name)) if name else directory
+                changed.add(path)
+                root = self._root_of(directory)
+                if self.gitignore and os.path.basename(path) == IGNORE_FILE:
+                    reload.add(root)
+                elif mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    if not _pruned(self._ignores[root], _relpath(root, directory), os.path.basename(path)):
+                        self._watch_tree(root, path)
+        for root in reload:
+            self._ignores[root] = IgnoreMatcher(root)
+            self._watch_tree(root)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+class PollingWatcher:
+    """Portable fallback that diffs (mtime, size) of every entry on an interval.
+
+    Directories are pruned like InotifyWatcher does, with the ignore files
+    re-read on every scan.
+    """
+
+    def __init__(self, roots, interval=2.0, gitignore=True):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.interval = interval
+        self.gitignore = gitignore
+        self._state = self._scan()
+
+    def _scan(self):
+        state = {}
+        for root in self.roots:
+            for directory in _directories(root, IgnoreMatcher(root) if self.gitignore else None):
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            if entry.name in ALWAYS_IGNORED:
+                                continue
+                            try:
+                                stat = entry.stat(follow_symlinks=False)
+                            except FileNotFoundError:
+                                continue
+                            state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                except (PermissionError, FileNotFoundError, NotADirectoryError):
+                    continue
+        return state
+
+    def poll(self, timeout=None):
+        """Waits up to timeout seconds (at most one interval) and returns the changed paths."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        state = self._scan()
+        changed = {path for path in state.keys() | self._state.keys() if state.get(path) != self._state.get(path)}
+        self._state = state
+        return changed
+
+    def close(self):
+        pass
+
+class _RootWorker:
+    """Runs regenerations of one root, never more than one at a time.
+
+    Changes that arrive while a regeneration runs are merged and handled by
+    a single follow-up run.
+    """
+
+    def __init__(self, root, regenerate):
+        self.root = root
+        self.regenerate = regenerate
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._full = False
+        self._running = False
+        self._thread = None
+
+    def submit(self, paths, full):
+        with self._lock:
+            self._pending |= paths
+            self._full = self._full or full
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"regenerate {self.root}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending and not self._full:
+                    self._running = False
+                    return
+                paths, full = self._pending, self._full
+                self._pending, self._full = set(), False
+            try:
+                self.regenerate(self.root, None if full else paths)
+            except Exception as e:
+                print(f"Error regenerating {self.root}: {e}", file=sys.stderr)
+
+class WatchDaemon:
+    """Regenerates structure documents when files below the roots change.
+
+    Events are merged into debounce windows: a window closes after
+    debounce seconds without new events, or after max_delay seconds at the
+    latest. Each window is deduplicated by root and handed to that root's
+    worker together with the changed paths, so a git checkout touching
+    thousands of files costs one regeneration per root.
+    """
+
+    def __init__(self, roots, regenerate, debounce=0.5, max_delay=5.0, poll_interval=2.0, gitignore=True):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.gitignore = gitignore
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.workers = {root: _RootWorker(root, regenerate) for root in self.roots}
+        try:
+            self.watcher = InotifyWatcher(self.roots, gitignore)
+        except OSError as e:
+            print(f"inotify unavailable ({e}); polling every {poll_interval}s", file=sys.stderr)
+            self.watcher = PollingWatcher(self.roots, poll_interval, gitignore)
+
+    def _poll(self, timeout=None):
+        """Polls the watcher, switching to PollingWatcher when inotify fails while running.
+
+        Watching a new directory can hit the watch limit (ENOSPC) or a
+        permission error; events may have been lost by then, so every root
+        is reported as changed.
+        """
+        try:
+            return self.watcher.poll(timeout)
+        except OSError as e:
+            if isinstance(self.watcher, PollingWatcher):
+                raise
+            print(f"inotify failed ({e}); polling every {self.poll_interval}s", file=sys.stderr)
+            self.watcher.close()
+            self.watcher = PollingWatcher(self.roots, self.poll_interval, self.gitignore)
+            return set(self.roots)
+
+    def _root_of(self, path):
+        return _root_of(self.roots, path)
+
+    def _dispatch(self, changed):
+        by_root = {}
+        for path in changed:
+            root = self._root_of(path)
+            name = os.path.basename(path)
+            if root is None or OUTPUT_NAME in name or is_temporary(name):
+                continue
+            paths, full = by_root.get(root, (set(), False))
+            if path == root:
+                full = True
+            else:
+                paths.add(path)
+            by_root[root] = (paths, full)
+
+        for root, (paths, full) in by_root.items():
+            self.workers[root].submit(paths, full)
+
+    def run(self):
+        """Watches until interrupted."""
+        try:
+            while True:
+                changed = self._poll()
+                if not changed:
+                    continue
+                deadline = time.monotonic() + self.max_delay
+                while time.monotonic() < deadline:
+                    more = self._poll(self.debounce)
+                    if not more:
+                        break
+                    changed |= more
+                self._dispatch(changed)
+        finally:
+            self.watcher.close()
@@ -0,0 +1,120 @@
+import errno
+import os
+import shutil
+import stat
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux ioctl that makes a file share the extents of another (btrfs, XFS, ...).
+FICLONE = 0x40049409
+COPY_CHUNK = 1024 * 1024
+
+# Static files every scaffold gets, relative to the plugin directory. They are
+# taken from the same relative path in the repository, or its backup copy.
+ASSETS = (
+    "gradlew",
+    "gradlew.bat",
+    "gradle/wrapper/gradle-wrapper.jar",
+    "gradle/wrapper/gradle-wrapper.properties"
+)
+ASSET_ROOTS = (".", "backup_before_reorganize")
+
+# Errors that mean "this way of sharing data does not work here", not "the copy failed".
+_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL,
+                errno.ENOSYS, errno.ETXTBSY, errno.EBADF, errno.ENOTTY}
+
+def find_asset(base_path: Path, relpath):
+    """Returns the source file for an asset, or None when the repository does not have it."""
+    for root in ASSET_ROOTS:
+        path = base_path / root / relpath
+        if path.is_file():
+            return path
+    return None
+
+def _reflink(src, dst):
+    if fcntl is None:
+        raise OSError(errno.ENOTSUP, "reflinks are not supported on this platform")
+    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+def _copy_file_range(src, dst, size):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    copied = 0
+    while copied < size:
+        count = os.copy_file_range(src.fileno(), dst.fileno(), size - copied)
+        if count == 0:
+            break
+        copied += count
+
+def _sendfile(src, dst, size):
+    copied = 0
+    while copied < size:
+        count = os.sendfile(dst.fileno(), src.fileno(), copied, size - copied)
+        if count == 0:
+            break
+        copied += count
+
+def _copy_contents(source, destination, size):
+    """Copies into a fresh file with the cheapest method that works and returns its name."""
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        try:
+            _reflink(src, dst)
+            return "reflink"
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+        for name, copy in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile)):
+            try:
+                copy(src, dst, size)
+                return name
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED:
+                    raise
+                # A partial copy must not be continued by another method.
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        shutil.copyfileobj(src, dst, COPY_CHUNK)
+        return "copy"
+
+def materialize(source, destination, link=True):
+    """Puts the content of source at destination and returns how: hardlink, reflink,
+    copy_file_range, sendfile or copy.
+
+    A hard link costs no data at all but shares the inode, so editing the
+    destination in place edits the source too; link=False skips it. Every
+    other method produces an independent file, with the data shared by the
+    file system (reflink) or copied in the kernel where possible, and a
+    buffered copy only as the last resort. The permission bits of source
+    are kept, so gradlew stays executable.
+    """
+    source, destination = Path(source), Path(destination)
+    info = source.stat()
+    if link:
+        try:
+            destination.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(source, destination)
+            return "hardlink"
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+
+    tmp_path = destination.with_name(f".{destination.name}.tmp")
+    try:
+        method = _copy_contents(source, tmp_path, info.st_size)
+        os.chmod(tmp_path, stat.S_IMODE(info.st_mode))
+        os.replace(tmp_path, destination)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+    return method
@@ -0,0 +1,140 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from setup.builders import create_builders
+from setup.builders.base import DEFAULT_VARIABLES
+from setup.manifest import OutputManifest
+from setup.output import ArchiveBackend, DiskBackend
+from setup.scheduler import BuildScheduler
+from setup.template_registry import TemplateRegistry
+
+# Set in each worker process from the parent's already loaded registry.
+_templates = None
+
+def load_spec(path):
+    """Reads a batch spec and returns one dict per project.
+
+    The spec is JSON with an optional "defaults" object and a "projects"
+    list. Each project may set "name", "output" (the plugin directory to
+    write, defaulting to the name) or "archive" (a tar/zip file to stream
+    into instead); every other key, such as group, plugin_id, since_build
+    or until_build, is a template variable and has to be one of
+    DEFAULT_VARIABLES, so a misspelt key raises ValueError instead of
+    being ignored.
+    """
+    spec = read_spec(path)
+    if "projects" not in spec:
+        raise ValueError('Spec has no "projects" list')
+
+    defaults = spec.get("defaults", {})
+    projects = []
+    for index, entry in enumerate(spec["projects"], start=1):
+        variables = {**defaults, **entry}
+        name = variables.pop("name", f"project-{index}")
+        output = variables.pop("output", name)
+        archive = variables.pop("archive", None)
+        check_variables(name, variables)
+        projects.append({"name": name, "output": output, "archive": archive, "variables": variables})
+    check_destinations(projects)
+    return projects
+
+def read_spec(path):
+    """Reads a JSON spec file, raising ValueError when it is missing, unreadable or not an object."""
+    try:
+        with open(path, 'r') as f:
+            spec = json.load(f)
+    except OSError as e:
+        raise ValueError(e.strerror) from e
+    if not isinstance(spec, dict):
+        raise ValueError("Spec is not a JSON object")
+    return spec
+
+def check_variables(name, variables):
+    """Raises ValueError when a project sets a variable that no template uses."""
+    unknown = sorted(variables.keys() - DEFAULT_VARIABLES.keys())
+    if unknown:
+        raise ValueError(f"Project '{name}' sets unknown variable(s) {', '.join(unknown)}; "
+                         f"expected one of {', '.join(DEFAULT_VARIABLES)}")
+
+def check_destinations(projects):
+    """Raises ValueError when two projects would be written to the same directory or archive."""
+    seen = {}
+    for project in projects:
+        destination = str(Path(project["archive"] or project["output"]).resolve())
+        if destination in seen:
+            raise ValueError(f"Projects '{seen[destination]}' and '{project['name']}' both write to {destination}")
+        seen[destination] = project["name"]
+
+def _init_worker(template_root, entries):
+    global _templates
+    _templates = TemplateRegistry.from_export(template_root, entries)
+
+def _project_output(project):
+    if project["archive"]:
+        archive = project["archive"]
+        Path(archive).parent.mkdir(parents=True, exist_ok=True)
+        return ArchiveBackend(archive, ArchiveBackend.format_for(archive), prefix=project["name"]), archive
+    plugin_path = Path(project["output"])
+    return DiskBackend(plugin_path, OutputManifest(plugin_path), project.get("link", True)), str(plugin_path)
+
+def scaffold_project(base_path, project, templates=None):
+    """Scaffolds one project of a batch and returns its report entry; never raises."""
+    start = time.perf_counter()
+    report = {"name": project["name"], "ok": False, "output": project["archive"] or project["output"]}
+    try:
+        output, report["output"] = _project_output(project)
+        try:
+            BuildScheduler(create_builders(base_path, output, templates or _templates, project["variables"]), max_workers=4).run()
+        finally:
+            output.close()
+        report["ok"] = True
+        manifest = getattr(output, "manifest", None)
+        if manifest is not None:
+            report["written"] = manifest.written
+            report["skipped"] = manifest.skipped
+            report["assets"] = output.copies
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+def run_batch(spec_path, base_path: Path, workers=None, link=True):
+    """Scaffolds every project of a spec on a process pool and returns the reports in spec order.
+
+    Templates are loaded once in this process (through the marshal cache)
+    and handed to every worker, so no worker reads a template file. Static
+    assets are hard-linked into every project unless link is False.
+    """
+    projects = load_spec(spec_path)
+    for project in projects:
+        project["link"] = link
+    templates = TemplateRegistry(
+        base_path / "setup/templates",
+        cache_path=base_path / ".setup-cache/templates.marshal"
+    )
+    entries = templates.export()
+
+    workers = min(workers or os.cpu_count() or 1, len(projects)) or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(templates.template_root, entries)) as pool:
+        futures = [pool.submit(scaffold_project, base_path, project) for project in projects]
+        return [future.result() for future in futures]
+
+def print_report(reports, out=sys.stdout):
+    """Prints one line per project and returns the number of failures."""
+    failures = 0
+    for report in reports:
+        if report["ok"]:
+            files = f"  {report['written']} written, {report['skipped']} unchanged" if "written" in report else ""
+            if report.get("assets"):
+                files += "  (assets: " + ", ".join(f"{n} by {method}" for method, n in sorted(report["assets"].items())) + ")"
+            print(f"ok    {report['name']:<24} {report['seconds'] * 1000:8.1f} ms  {report['output']}{files}", file=out)
+        else:
+            failures += 1
+            print(f"FAIL  {report['name']:<24} {report['seconds'] * 1000:8.1f} ms  {report['error']}", file=out)
+    print(f"{len(reports) - failures} of {len(reports)} project(s) scaffolded", file=out)
+    return failures
@@ -0,0 +1,26 @@
+import importlib
+
+# Builder name -> "module:class", in scaffold order. Modules are imported only
+# when a builder is created, so importing this package costs nothing.
+BUILDERS = {
+    "directories": "setup.builders.directory_builder:DirectoryBuilder",
+    "gradle": "setup.builders.gradle_builder:GradleBuilder",
+    "kotlin": "setup.builders.kotlin_builder:KotlinBuilder",
+    "assets": "setup.builders.asset_builder:AssetBuilder"
+}
+
+def builder_class(name):
+    """Imports and returns the builder class registered under name."""
+    module, _, attribute = BUILDERS[name].partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+def create_builders(base_path, output=None, templates=None, variables=None):
+    """Returns the builders that make up one plugin scaffold."""
+    return [builder_class(name)(base_path, output, templates, variables) for name in BUILDERS]
+
+def __getattr__(name):
+    # Keeps "from setup.builders import KotlinBuilder" working without eager imports.
+    for key, target in BUILDERS.items():
+        if target.rpartition(":")[2] == name:
+            return builder_class(key)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,19 @@
+from functools import partial
+
+from setup.assets import ASSETS, find_asset
+from setup.builders.base import Builder
+
+class AssetBuilder(Builder):
+    name = "assets"
+    depends_on = ("directories",)
+
+    def tasks(self):
+        """Fills in the Gradle wrapper and other static files."""
+        return [partial(self._copy_asset, relpath) for relpath in ASSETS]
+
+    def _copy_asset(self, relpath):
+        source = find_asset(self.base_path, relpath)
+        if source is None:
+            print(f"Asset {relpath} not found in the repository; skipped")
+            return
+        self.output.copy(relpath, source)
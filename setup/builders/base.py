@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from setup.output import DiskBackend
+from setup.template_registry import TemplateRegistry
+
+# Values substituted into the templates unless a project overrides them.
+DEFAULT_VARIABLES = {
+    "group": "com.your.plugin",
+    "plugin_id": "com.your.plugin.repo-structure",
+    "plugin_version": "1.0-SNAPSHOT",
+    "kotlin_version": "1.9.22",
+    "intellij_gradle_plugin_version": "1.17.2",
+    "intellij_version": "2023.3.3",
+    "platform_type": "IC",
+    "jvm_toolchain": "17",
+    "since_build": "233",
+    "until_build": "241.*"
+}
+
+class Builder:
+    """Base class for the scaffold builders.
+
+    Each builder names itself, lists the builders that have to finish before
+    it may start and splits its work into independent steps, so the
+    scheduler can run the steps of unrelated builders side by side. Files
+    and directories go to an OutputBackend, the plugin directory on disk
+    unless another backend is passed in.
+    """
+
+    name = None
+    depends_on = ()
+
+    def __init__(self, base_path: Path, output=None, templates=None, variables=None):
+        self.base_path = base_path
+        self.plugin_path = base_path / "repo-structure-plugin"
+        self.output = output or DiskBackend(self.plugin_path)
+        self.templates = templates or TemplateRegistry.shared(base_path / "setup/templates")
+        self.variables = {**DEFAULT_VARIABLES, **(variables or {})}
+
+    def tasks(self):
+        """Returns the independent steps of this builder as callables."""
+        return []
+
+    def build(self):
+        """Runs every step of this builder one after another."""
+        for task in self.tasks():
+            task()
@@ -1,12 +1,11 @@
+from functools import partial
 
-from pathlib import Path
+from setup.builders.base import Builder
 
-class DirectoryBuilder:
-    def __init__(self, base_path: Path):
-        self.base_path = base_path
-        self.plugin_path = base_path / "repo-structure-plugin"
+class DirectoryBuilder(Builder):
+    name = "directories"
 
-    def build(self):
+    def tasks(self):
         """Creates the basic directory structure for the plugin."""
         directories = [
             "src/main/kotlin/com/your/plugin",
@@ -15,5 +14,7 @@ class DirectoryBuilder:
             "gradle/wrapper"
         ]
 
-        for directory in directories:
-            (self.plugin_path / directory).mkdir(parents=True, exist_ok=True)
+        return [partial(self._create_directory, directory) for directory in directories]
+
+    def _create_directory(self, directory):
+        self.output.mkdir(directory)
@@ -1,34 +1,25 @@
+from setup.builders.base import Builder
 
-from pathlib import Path
-from string import Template
+class GradleBuilder(Builder):
+    name = "gradle"
+    depends_on = ("directories",)
 
-class GradleBuilder:
-    def __init__(self, base_path: Path):
-        self.base_path = base_path
-        self.plugin_path = base_path / "repo-structure-plugin"
-        self.template_dir = base_path / "setup/templates/gradle"
-
-    def build(self):
+    def tasks(self):
         """Creates all Gradle-related files."""
-        self._create_build_gradle()
-        self._create_settings_gradle()
-        self._create_gradle_properties()
+        return [
+            self._create_build_gradle,
+            self._create_settings_gradle,
+            self._create_gradle_properties
+        ]
 
     def _create_build_gradle(self):
-        with open(self.template_dir / "build.gradle.kts.template", 'r') as f:
-            template = Template(f.read())
-        content = template.substitute({})
-        with open(self.plugin_path / "build.gradle.kts", 'w') as f:
-            f.write(content)
+        content = self.templates.render("gradle/build.gradle.kts.template", self.variables)
+        self.output.write("build.gradle.kts", content)
 
     def _create_settings_gradle(self):
-        with open(self.template_dir / "settings.gradle.kts.template", 'r') as f:
-            content = f.read()
-        with open(self.plugin_path / "settings.gradle.kts", 'w') as f:
-            f.write(content)
+        content = self.templates.text("gradle/settings.gradle.kts.template")
+        self.output.write("settings.gradle.kts", content)
 
     def _create_gradle_properties(self):
-        with open(self.template_dir / "gradle.properties.template", 'r') as f:
-            content = f.read()
-        with open(self.plugin_path / "gradle.properties", 'w') as f:
-            f.write(content)
+        content = self.templates.text("gradle/gradle.properties.template")
+        self.output.write("gradle.properties", content)
@@ -1,14 +1,14 @@
+from functools import partial
 
-from pathlib import Path
+from setup.builders.base import Builder
 
-class KotlinBuilder:
-    def __init__(self, base_path: Path):
-        self.base_path = base_path
-        self.plugin_path = base_path / "repo-structure-plugin"
-        self.template_dir = base_path / "setup/templates/kotlin"
-        self.kotlin_dir = self.plugin_path / "src/main/kotlin/com/your/plugin"
+class KotlinBuilder(Builder):
+    name = "kotlin"
+    depends_on = ("directories",)
 
-    def build(self):
+    kotlin_dir = "src/main/kotlin/com/your/plugin"
+
+    def tasks(self):
         """Creates all Kotlin source files."""
         kotlin_files = [
             "RepoStructurePlugin.kt",
@@ -17,17 +17,14 @@ class KotlinBuilder:
             "UpdateStructureAction.kt"
         ]
 
-        for file in kotlin_files:
-            with open(self.template_dir / f"{file}.template", 'r') as f:
-                content = f.read()
-            with open(self.kotlin_dir / file, 'w') as f:
-                f.write(content)
+        tasks = [partial(self._create_kotlin_file, file) for file in kotlin_files]
+        tasks.append(self._create_plugin_xml)
+        return tasks
 
-        self._create_plugin_xml()
+    def _create_kotlin_file(self, file):
+        content = self.templates.text(f"kotlin/{file}.template")
+        self.output.write(f"{self.kotlin_dir}/{file}", content)
 
     def _create_plugin_xml(self):
-        plugin_template_dir = self.base_path / "setup/templates/plugin"
-        with open(plugin_template_dir / "plugin.xml.template", 'r') as f:
-            content = f.read()
-        with open(self.plugin_path / "src/main/resources/META-INF/plugin.xml", 'w') as f:
-            f.write(content)
+        content = self.templates.render("plugin/plugin.xml.template", self.variables)
+        self.output.write("src/main/resources/META-INF/plugin.xml", content)
@@ -0,0 +1,63 @@
+import subprocess
+from pathlib import Path
+
+COPY_CHUNK = 1024 * 1024
+
+def _git(repo_path, *args, **kwargs):
+    return subprocess.run(["git", *args], cwd=repo_path, check=True, **kwargs)
+
+def _committer(repo_path):
+    """Returns "Name <email> time tz" as git would use it for a commit."""
+    return _git(repo_path, "var", "GIT_COMMITTER_IDENT", stdout=subprocess.PIPE).stdout.decode("utf-8").strip()
+
+def _head_ref(repo_path):
+    return _git(repo_path, "symbolic-ref", "HEAD", stdout=subprocess.PIPE).stdout.decode("utf-8").strip()
+
+def _write_blob(stream, mark, content):
+    stream.write(f"blob\nmark :{mark}\n".encode("ascii"))
+    if isinstance(content, Path):
+        size = content.stat().st_size
+        stream.write(f"data {size}\n".encode("ascii"))
+        with open(content, 'rb') as f:
+            while True:
+                chunk = f.read(COPY_CHUNK)
+                if not chunk:
+                    break
+                stream.write(chunk)
+    else:
+        stream.write(f"data {len(content)}\n".encode("ascii"))
+        stream.write(content)
+    stream.write(b"\n")
+
+def fast_import(repo_path: Path, files, message):
+    """Creates the first commit of a freshly initialized repository from in-memory files.
+
+    files maps POSIX paths to (mode, content), content being bytes or the
+    Path of a file to stream. Everything goes through a single
+    git fast-import process, so nothing in the work tree is hashed or
+    stat-ed again; the index is then filled from the new commit with
+    read-tree (the first git status refreshes its stat data).
+    """
+    committer = _committer(repo_path)
+    ref = _head_ref(repo_path)
+    process = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=repo_path, stdin=subprocess.PIPE)
+    try:
+        marks = {}
+        for mark, (path, (_, content)) in enumerate(sorted(files.items()), start=1):
+            _write_blob(process.stdin, mark, content)
+            marks[path] = mark
+
+        data = message.encode("utf-8")
+        process.stdin.write(f"commit {ref}\ncommitter {committer}\ndata {len(data)}\n".encode("utf-8"))
+        process.stdin.write(data + b"\n")
+        for path, (mode, _) in sorted(files.items()):
+            process.stdin.write(f"M {mode:o} :{marks[path]} {path}\n".encode("utf-8"))
+        process.stdin.write(b"\ndone\n")
+        process.stdin.close()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, "git fast-import")
+    _git(repo_path, "read-tree", "HEAD")
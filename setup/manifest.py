@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from setup.assets import materialize
+
+class OutputManifest:
+    """Remembers what every generated file looked like after the last run.
+
+    Entries map a path relative to the plugin directory to the SHA-256 of its
+    content plus the size and mtime the file had right after it was written.
+    A file whose rendered content hashes the same and whose size and mtime
+    still match is left alone, so Gradle and the IDE do not see a change.
+    The manifest lives next to the plugin directory as
+    ``<plugin dir>.manifest.json``.
+    """
+
+    def __init__(self, plugin_path: Path):
+        self.plugin_path = Path(plugin_path)
+        self.path = self.plugin_path.with_name(f"{self.plugin_path.name}.manifest.json")
+        self.entries = self._load()
+        self.written = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _key(self, path):
+        return Path(path).relative_to(self.plugin_path).as_posix()
+
+    def is_current(self, path, digest):
+        """Checks whether path still holds the content recorded under digest."""
+        entry = self.entries.get(self._key(path))
+        if entry is None or entry.get("sha256") != digest:
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
+
+    def write(self, path, content):
+        """Writes content to path unless the file already holds exactly that."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        key = self._key(path)
+
+        if self.is_current(path, digest):
+            with self._lock:
+                self.skipped += 1
+            return False
+
+        with open(path, 'wb') as f:
+            f.write(data)
+        stat = os.stat(path)
+        with self._lock:
+            self.entries[key] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            self.written += 1
+        return True
+
+    def copy(self, path, source, link=True):
+        """Materializes source at path unless path still holds the copy recorded for it.
+
+        Returns the method materialize() used, or None when the file was current.
+        """
+        info = os.stat(source)
+        origin = [os.fspath(source), info.st_size, info.st_mtime_ns]
+        key = self._key(path)
+        entry = self.entries.get(key)
+        if entry is not None and entry.get("source") == origin:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stat = None
+            if stat is not None and stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+                with self._lock:
+                    self.skipped += 1
+                return None
+
+        method = materialize(source, path, link)
+        stat = os.stat(path)
+        with self._lock:
+            self.entries[key] = {"source": origin, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            self.written += 1
+        return method
+
+    def save(self):
+        """Persists the manifest, replacing the previous one atomically."""
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def report(self):
+        """Prints how many files were written and how many were unchanged."""
+        print(f"{self.written} file(s) written, {self.skipped} unchanged file(s) skipped")
@@ -0,0 +1,101 @@
+import itertools
+from pathlib import Path
+from string import Template
+
+from setup.batch import check_destinations, check_variables, read_spec, scaffold_project
+from setup.builders.base import DEFAULT_VARIABLES
+from setup.template_registry import TemplateRegistry
+
+DEFAULT_OUTPUT = "matrix/default"
+
+def expand(spec):
+    """Expands a matrix spec into one variable dict per variant.
+
+    "matrix" maps axis names to lists of values; a plain value sets the
+    variable of the same name, an object sets several at once (e.g. an
+    IntelliJ version together with its since/until builds). Variants are
+    the cartesian product of the axes over "defaults", followed by any
+    extra variants listed under "include".
+    """
+    defaults = spec.get("defaults", {})
+    axes = spec.get("matrix", {})
+    variants = []
+    for combination in itertools.product(*axes.values()):
+        variables = dict(defaults)
+        for axis, value in zip(axes, combination):
+            if isinstance(value, dict):
+                variables.update(value)
+            else:
+                variables[axis] = value
+        variants.append(variables)
+    variants.extend({**defaults, **extra} for extra in spec.get("include", []))
+    return variants
+
+def default_output(spec):
+    """Returns an output template naming a variant by every variable the matrix varies.
+
+    That is every axis, the variables set by object-valued axes and those
+    set by "include" entries, in spec order.
+    """
+    names = []
+    for axis, values in spec.get("matrix", {}).items():
+        for value in values:
+            for name in (value if isinstance(value, dict) else [axis]):
+                if name not in names:
+                    names.append(name)
+    for extra in spec.get("include", []):
+        names.extend(name for name in extra if name not in names)
+    if not names:
+        return DEFAULT_OUTPUT
+    return "matrix/" + "-".join(f"${{{name}}}" for name in names)
+
+def _substitute(template, mapping):
+    try:
+        return template.substitute(mapping)
+    except KeyError as e:
+        raise ValueError(f"Template '{template.template}' uses unknown variable {e.args[0]}") from None
+
+def load_projects(path):
+    """Reads a matrix spec and returns one batch project per variant.
+
+    "output" (or "archive") is a template for each variant's destination,
+    filled with the variant's variables; by default the output directory
+    is named after every variable the matrix varies. Two variants with the
+    same destination, a variable not in DEFAULT_VARIABLES, or a template
+    naming a variable the variant does not have, raise ValueError.
+    """
+    spec = read_spec(path)
+    output = Template(spec.get("output", default_output(spec)))
+    archive = Template(spec["archive"]) if "archive" in spec else None
+    projects = []
+    for variables in expand(spec):
+        mapping = {**DEFAULT_VARIABLES, **variables}
+        name = _substitute(output, mapping)
+        check_variables(name, variables)
+        projects.append({
+            "name": name,
+            "output": name,
+            "archive": _substitute(archive, mapping) if archive else None,
+            "variables": variables
+        })
+    check_destinations(projects)
+    return projects
+
+def render_matrix(spec_path, base_path: Path, link=True):
+    """Scaffolds every variant of a matrix spec in this process and returns the batch reports.
+
+    All variants share one TemplateRegistry, so a template is rendered
+    once per distinct combination of the variables it uses; files that do
+    not depend on the varying axes are rendered once for the whole matrix.
+    """
+    templates = TemplateRegistry(
+        base_path / "setup/templates",
+        cache_path=base_path / ".setup-cache/templates.marshal"
+    )
+    templates.load()
+    projects = load_projects(spec_path)
+    for project in projects:
+        project["link"] = link
+    reports = [scaffold_project(base_path, project, templates) for project in projects]
+    print(f"Templates: {templates.renders} rendered, {templates.reuses} reused")
+    return reports
@@ -0,0 +1,273 @@
+import gzip
+import io
+import os
+import stat
+import tarfile
+import threading
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from setup.assets import materialize
+
+class OutputBackend(ABC):
+    """Destination for a generated scaffold.
+
+    Paths are POSIX paths relative to the plugin directory. Backends must
+    accept calls from several builder threads at once.
+    """
+
+    @abstractmethod
+    def mkdir(self, relpath):
+        """Creates the directory relpath and its parents."""
+
+    @abstractmethod
+    def write(self, relpath, content):
+        """Stores content (str or bytes) under relpath."""
+
+    def copy(self, relpath, source):
+        """Stores the content of the file at source under relpath."""
+        with open(source, 'rb') as f:
+            self.write(relpath, f.read())
+
+    def close(self):
+        """Finishes the output; nothing may be written afterwards."""
+
+    def report(self):
+        """Prints a summary of what was written."""
+
+def _encode(content):
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+class DiskBackend(OutputBackend):
+    """Writes straight into a directory, optionally through an OutputManifest.
+
+    Copied files are materialized with hard links where possible (unless
+    link is False), then reflinks or in-kernel copies; copies counts the
+    methods used.
+    """
+
+    def __init__(self, root: Path, manifest=None, link=True):
+        self.root = Path(root)
+        self.manifest = manifest
+        self.link = link
+        self.copies = {}
+        self._lock = threading.Lock()
+
+    def mkdir(self, relpath):
+        (self.root / relpath).mkdir(parents=True, exist_ok=True)
+
+    def write(self, relpath, content):
+        path = self.root / relpath
+        if self.manifest is not None:
+            self.manifest.write(path, content)
+            return
+        with open(path, 'wb') as f:
+            f.write(_encode(content))
+
+    def copy(self, relpath, source):
+        path = self.root / relpath
+        if self.manifest is not None:
+            method = self.manifest.copy(path, source, self.link)
+        else:
+            method = materialize(source, path, self.link)
+        if method is not None:
+            with self._lock:
+                self.copies[method] = self.copies.get(method, 0) + 1
+
+    def close(self):
+        if self.manifest is not None:
+            self.manifest.save()
+
+    def report(self):
+        if self.manifest is not None:
+            self.manifest.report()
+        if self.copies:
+            print("Assets: " + ", ".join(f"{count} by {method}" for method, count in sorted(self.copies.items())))
+
+class ArchiveBackend(OutputBackend):
+    """Writes the scaffold into a tar, tar.gz or zip archive.
+
+    target is a path or a writable binary file object such as
+    sys.stdout.buffer. Tar output is written in stream mode, so the target
+    never needs to be seekable; entries are stored under prefix. Members
+    are collected as the builders produce them and written sorted by name
+    on close, with one timestamp (SOURCE_DATE_EPOCH when set), so the same
+    scaffold always gives the same archive whatever order the builder
+    threads finish in.
+    """
+
+    FORMATS = ("tar", "tar.gz", "zip")
+
+    def __init__(self, target, format="tar", prefix="repo-structure-plugin"):
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown archive format '{format}', expected one of {', '.join(self.FORMATS)}")
+        self.format = format
+        self.prefix = prefix.strip("/")
+        self.mtime = int(os.environ.get("SOURCE_DATE_EPOCH") or time.time())
+        self.entries = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._directories = set()
+        # {name: (data, mode)}; data is None for directories.
+        self._members = {}
+        self._owned = None
+        if isinstance(target, (str, Path)):
+            target = self._owned = open(target, 'wb')
+        self._target = target
+
+    @classmethod
+    def format_for(cls, path):
+        """Guesses the archive format from a file name."""
+        name = str(path)
+        if name.endswith(".zip"):
+            return "zip"
+        if name.endswith((".tar.gz", ".tgz")):
+            return "tar.gz"
+        return "tar"
+
+    def _name(self, relpath):
+        relpath = str(relpath).strip("/")
+        return f"{self.prefix}/{relpath}" if self.prefix else relpath
+
+    def _add_directory(self, name):
+        # Caller holds the lock.
+        if name in self._directories:
+            return
+        parent = name.rpartition("/")[0]
+        if parent:
+            self._add_directory(parent)
+        self._directories.add(name)
+        self._members[name] = (None, 0o755)
+        self.entries += 1
+
+    def mkdir(self, relpath):
+        with self._lock:
+            self._add_directory(self._name(relpath))
+
+    def write(self, relpath, content, mode=0o644):
+        data = _encode(content)
+        name = self._name(relpath)
+        with self._lock:
+            parent = name.rpartition("/")[0]
+            if parent:
+                self._add_directory(parent)
+            previous = self._members.get(name)
+            if previous is None:
+                self.entries += 1
+            else:
+                self.bytes -= len(previous[0])
+            self._members[name] = (data, mode)
+            self.bytes += len(data)
+
+    def copy(self, relpath, source):
+        with open(source, 'rb') as f:
+            self.write(relpath, f.read(), stat.S_IMODE(os.fstat(f.fileno()).st_mode))
+
+    def _write_zip(self, members):
+        date_time = time.localtime(self.mtime)[:6]
+        with zipfile.ZipFile(self._target, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, (data, mode) in members:
+                if data is None:
+                    info = zipfile.ZipInfo(f"{name}/", date_time)
+                    info.external_attr = ((stat.S_IFDIR | mode) << 16) | 0x10
+                    archive.writestr(info, b"")
+                else:
+                    info = zipfile.ZipInfo(name, date_time)
+                    info.external_attr = (stat.S_IFREG | mode) << 16
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    archive.writestr(info, data)
+
+    def _write_tar(self, members):
+        # gzip is applied here rather than by tarfile, whose gzip header
+        # would carry the current time.
+        compressed = None
+        target = self._target
+        if self.format == "tar.gz":
+            target = compressed = gzip.GzipFile(filename="", mode="wb", fileobj=target, mtime=self.mtime)
+        with tarfile.open(fileobj=target, mode="w|") as archive:
+            for name, (data, mode) in members:
+                info = tarfile.TarInfo(name)
+                info.mode = mode
+                info.mtime = self.mtime
+                if data is None:
+                    info.type = tarfile.DIRTYPE
+                    archive.addfile(info)
+                else:
+                    info.size = len(data)
+                    archive.addfile(info, io.BytesIO(data))
+        if compressed is not None:
+            compressed.close()
+
+    def close(self):
+        with self._lock:
+            if self._members is None:
+                return
+            members = sorted(self._members.items())
+            self._members = None
+            try:
+                if self.format == "zip":
+                    self._write_zip(members)
+                else:
+                    self._write_tar(members)
+            finally:
+                if self._owned is not None:
+                    self._owned.close()
+
+    def report(self):
+        print(f"{self.entries} archive entries, {self.bytes} bytes of file content ({self.format})")
+
+class MemoryBackend(OutputBackend):
+    """Keeps the scaffold in memory as {relpath: bytes}, for tests and benchmarks."""
+
+    def __init__(self):
+        self.files = {}
+        self.directories = set()
+        self._lock = threading.Lock()
+
+    def mkdir(self, relpath):
+        with self._lock:
+            self.directories.add(str(relpath).strip("/"))
+
+    def write(self, relpath, content):
+        data = _encode(content)
+        with self._lock:
+            self.files[str(relpath).strip("/")] = data
+
+    def report(self):
+        print(f"{len(self.files)} file(s) kept in memory, {sum(map(len, self.files.values()))} bytes")
+
+class RecordingBackend(OutputBackend):
+    """Passes everything on to another backend and remembers what was stored.
+
+    files maps each relpath to (mode, content): the bytes written, or the
+    source Path of a copied file, so it can be streamed again later (as
+    git fast-import does) without reading back the output.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.files = {}
+        self._lock = threading.Lock()
+
+    def mkdir(self, relpath):
+        self.inner.mkdir(relpath)
+
+    def write(self, relpath, content):
+        data = _encode(content)
+        self.inner.write(relpath, data)
+        with self._lock:
+            self.files[str(relpath).strip("/")] = (0o100644, data)
+
+    def copy(self, relpath, source):
+        self.inner.copy(relpath, source)
+        executable = os.stat(source).st_mode & stat.S_IXUSR
+        with self._lock:
+            self.files[str(relpath).strip("/")] = (0o100755 if executable else 0o100644, Path(source))
+
+    def close(self):
+        self.inner.close()
+
+    def report(self):
+        self.inner.report()
@@ -0,0 +1,179 @@
+import contextlib
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_NULL_PHASE = contextlib.nullcontext()
+_active = None
+
+def _io_counters():
+    """Returns (bytes read, bytes written, read syscalls, write syscalls) of this process, or None."""
+    try:
+        with open("/proc/self/io", 'rb') as f:
+            fields = dict(line.split(b":", 1) for line in f.read().splitlines())
+    except OSError:
+        return None
+    return tuple(int(fields[key]) for key in (b"rchar", b"wchar", b"syscr", b"syscw"))
+
+def _io_overhead():
+    """Returns what reading /proc/self/io once adds to its own counters."""
+    before = _io_counters()
+    after = _io_counters()
+    if before is None or after is None:
+        return None
+    return tuple(b - a for a, b in zip(before, after))
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+class _Phase:
+    __slots__ = ("profiler", "node", "io")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.node = {"name": name, "children": []}
+
+    def __enter__(self):
+        self.profiler._push(self.node)
+        self.io = _io_counters()
+        self.node["start"] = time.perf_counter() - self.profiler.started
+        return self
+
+    def __exit__(self, *exc):
+        node = self.node
+        node["seconds"] = time.perf_counter() - self.profiler.started - node["start"]
+        io = _io_counters()
+        if io is not None and self.io is not None:
+            overhead = self.profiler.io_overhead
+            delta = [max(0, after - before - extra) for after, before, extra in zip(io, self.io, overhead)]
+            node["bytes_read"], node["bytes_written"], node["read_syscalls"], node["write_syscalls"] = delta
+        node["peak_rss_kb"] = _peak_rss_kb()
+        self.profiler._pop()
+        return False
+
+class Profiler:
+    """Records nested phase timings for one command.
+
+    Each phase stores its wall time, the bytes and read/write syscalls the
+    process performed meanwhile (from /proc/self/io, so concurrent phases on
+    other threads and child processes such as git are not separated) and
+    the peak RSS at its end. Phases opened on worker threads nest under
+    the phase that was open on the main thread when they started.
+    """
+
+    def __init__(self, command, trace_path=None, cprofile_path=None):
+        self.command = command
+        self.trace_path = os.path.abspath(trace_path) if trace_path else None
+        self.cprofile_path = os.path.abspath(cprofile_path) if cprofile_path else None
+        self.root = {"name": command, "children": []}
+        self.started = time.perf_counter()
+        self._local = threading.local()
+        self._main_stack = [self.root]
+        self._lock = threading.Lock()
+        self._cprofile = None
+        self.io_overhead = _io_overhead() or (0, 0, 0, 0)
+
+    def _stack(self):
+        if threading.current_thread() is threading.main_thread():
+            return self._main_stack
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _push(self, node):
+        stack = self._stack()
+        if stack is self._main_stack:
+            parent = stack[-1]
+        else:
+            parent = stack[-1] if stack else self._main_stack[-1]
+            node["thread"] = threading.current_thread().name
+        with self._lock:
+            parent["children"].append(node)
+        stack.append(node)
+
+    def _pop(self):
+        self._stack().pop()
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def start(self):
+        if self.cprofile_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.root["seconds"] = time.perf_counter() - self.started
+        self.root["peak_rss_kb"] = _peak_rss_kb()
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+
+    def trace(self):
+        return {"command": self.command, "argv": sys.argv, "pid": os.getpid(), "root": self.root}
+
+    def write_trace(self):
+        # Imported here: every entry point imports this module, few write a trace.
+        import json
+        with open(self.trace_path, 'w') as f:
+            json.dump(self.trace(), f, indent=2)
+
+    def summary(self, out=sys.stderr):
+        pending = [(self.root, 0)]
+        while pending:
+            node, depth = pending.pop()
+            written = node.get("bytes_written")
+            io = f"  {node.get('bytes_read', 0):>10} B read {written:>10} B written" if written is not None else ""
+            print(f"{'  ' * depth}{node['name']:<{40 - 2 * depth}} {node.get('seconds', 0) * 1000:9.1f} ms{io}", file=out)
+            pending.extend((child, depth + 1) for child in reversed(node["children"]))
+
+def phase(name):
+    """Returns a context manager timing name, or a shared no-op when profiling is off."""
+    if _active is None:
+        return _NULL_PHASE
+    return _active.phase(name)
+
+def enable(command, trace_path=None, cprofile_path=None):
+    """Turns profiling on for the rest of the process."""
+    global _active
+    _active = Profiler(command, trace_path, cprofile_path)
+    _active.start()
+    return _active
+
+def finish():
+    """Stops profiling, writes the trace and cProfile dump and prints a summary."""
+    global _active
+    if _active is None:
+        return
+    profiler, _active = _active, None
+    profiler.stop()
+    profiler.summary()
+    if profiler.trace_path:
+        profiler.write_trace()
+        print(f"Profile trace written to {profiler.trace_path}", file=sys.stderr)
+    if profiler.cprofile_path:
+        print(f"cProfile stats written to {profiler.cprofile_path}", file=sys.stderr)
+
+def add_arguments(parser):
+    """Adds --profile and --cprofile to an argparse parser."""
+    parser.add_argument("--profile", nargs="?", const="profile-trace.json", metavar="TRACE",
+                        help="record per-phase timings, I/O and peak RSS to a JSON trace "
+                             "(default: profile-trace.json)")
+    parser.add_argument("--cprofile", metavar="FILE", help="also dump cProfile stats to FILE")
+
+def enable_from_args(args, command):
+    """Enables profiling if --profile or --cprofile was given."""
+    if args.profile or args.cprofile:
+        enable(command, args.profile, args.cprofile)
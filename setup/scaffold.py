@@ -0,0 +1,97 @@
+import argparse
+import contextlib
+import sys
+from pathlib import Path
+from setup import profiling
+from setup.builders import create_builders
+from setup.manifest import OutputManifest
+from setup.output import ArchiveBackend, DiskBackend
+from setup.scheduler import BuildScheduler
+from setup.template_registry import TemplateRegistry
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaffold the repo-structure-plugin project.")
+    parser.add_argument("--archive", metavar="FILE",
+                        help="stream the scaffold into an archive instead of repo-structure-plugin/ (- for stdout)")
+    parser.add_argument("--archive-format", choices=ArchiveBackend.FORMATS,
+                        help="archive format (default: guessed from FILE, tar for stdout)")
+    parser.add_argument("--no-hardlinks", action="store_true",
+                        help="give every scaffold its own copy of the Gradle wrapper instead of hard links")
+    parser.add_argument("--batch", metavar="SPEC",
+                        help="scaffold every project listed in a JSON spec file, without prompting")
+    parser.add_argument("--matrix", metavar="SPEC",
+                        help="scaffold every variant of a JSON version matrix in one process")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes for --batch (default: one per core)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.batch and args.matrix:
+        parser.error("--batch and --matrix cannot be combined")
+
+    if args.matrix:
+        if args.archive:
+            parser.error("--archive cannot be combined with --matrix; set \"archive\" in the spec instead")
+        from setup.batch import print_report
+        from setup.matrix import render_matrix
+        profiling.enable_from_args(args, "setup.py --matrix")
+        try:
+            with profiling.phase("matrix"):
+                reports = render_matrix(args.matrix, Path.cwd(), not args.no_hardlinks)
+        except ValueError as e:
+            parser.error(f"{args.matrix}: {e}")
+        finally:
+            profiling.finish()
+        sys.exit(1 if print_report(reports) else 0)
+
+    if args.batch:
+        if args.archive:
+            parser.error("--archive cannot be combined with --batch; set \"archive\" per project instead")
+        from setup.batch import print_report, run_batch
+        profiling.enable_from_args(args, "setup.py --batch")
+        try:
+            with profiling.phase("batch"):
+                reports = run_batch(args.batch, Path.cwd(), args.jobs, not args.no_hardlinks)
+        except ValueError as e:
+            parser.error(f"{args.batch}: {e}")
+        finally:
+            profiling.finish()
+        sys.exit(1 if print_report(reports) else 0)
+
+    output = None
+    if args.archive:
+        target = sys.stdout.buffer if args.archive == "-" else args.archive
+        output = ArchiveBackend(target, args.archive_format or ArchiveBackend.format_for(args.archive))
+    elif args.no_hardlinks:
+        plugin_path = Path.cwd() / "repo-structure-plugin"
+        output = DiskBackend(plugin_path, OutputManifest(plugin_path), link=False)
+
+    profiling.enable_from_args(args, "setup.py")
+    # Keep stdout clean for the archive stream.
+    messages = contextlib.redirect_stdout(sys.stderr) if args.archive == "-" else contextlib.nullcontext()
+    try:
+        with messages:
+            scaffold(Path.cwd(), output)
+    finally:
+        profiling.finish()
+
+def scaffold(base_path: Path, output=None):
+    plugin_path = base_path / "repo-structure-plugin"
+    if output is None:
+        output = DiskBackend(plugin_path, OutputManifest(plugin_path))
+    templates = TemplateRegistry(
+        base_path / "setup/templates",
+        cache_path=base_path / ".setup-cache/templates.marshal"
+    )
+    builders = create_builders(base_path, output, templates)
+
+    try:
+        with profiling.phase("templates.load"):
+            templates.load()
+        with profiling.phase("build"):
+            scheduler = BuildScheduler(builders)
+            scheduler.run()
+        scheduler.report()
+    finally:
+        with profiling.phase("output.close"):
+            output.close()
+    output.report()
@@ -0,0 +1,93 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+
+from setup import profiling
+
+def _task_name(task):
+    if isinstance(task, partial):
+        return f"{task.func.__name__}({', '.join(map(str, task.args))})"
+    return getattr(task, "__name__", repr(task))
+
+def _run_task(builder_name, task):
+    with profiling.phase(f"{builder_name}.{_task_name(task)}"):
+        task()
+
+class BuildScheduler:
+    """Runs the steps of several builders on a thread pool.
+
+    A builder starts as soon as every builder named in its ``depends_on`` has
+    finished, and all of its steps are submitted at once. A full run therefore
+    takes as long as the slowest dependency chain rather than the sum of
+    every step.
+    """
+
+    def __init__(self, builders, max_workers=None):
+        self.builders = {builder.name: builder for builder in builders}
+        self.max_workers = max_workers
+        self.timings = {}
+        self._check_dependencies()
+
+    def _check_dependencies(self):
+        for name, builder in self.builders.items():
+            for dependency in builder.depends_on:
+                if dependency not in self.builders:
+                    raise ValueError(f"Builder '{name}' depends on unknown builder '{dependency}'")
+
+        resolved = set()
+        remaining = dict(self.builders)
+        while remaining:
+            ready = [name for name, builder in remaining.items() if resolved.issuperset(builder.depends_on)]
+            if not ready:
+                raise ValueError(f"Dependency cycle between builders: {', '.join(sorted(remaining))}")
+            for name in ready:
+                resolved.add(name)
+                del remaining[name]
+
+    def run(self):
+        """Runs every builder and records its wall time in ``self.timings``."""
+        waiting = dict(self.builders)
+        finished = set()
+        outstanding = {}
+        started = {}
+        futures = {}
+
+        def finish(name):
+            self.timings[name] = time.perf_counter() - started[name]
+            finished.add(name)
+
+        run_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while waiting or futures:
+                ready = [name for name, builder in waiting.items() if finished.issuperset(builder.depends_on)]
+                for name in ready:
+                    builder = waiting.pop(name)
+                    started[name] = time.perf_counter()
+                    tasks = builder.tasks()
+                    outstanding[name] = len(tasks)
+                    for task in tasks:
+                        futures[pool.submit(_run_task, name, task)] = name
+                    if not tasks:
+                        finish(name)
+                if ready and not futures:
+                    continue
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        for pending in futures:
+                            pending.cancel()
+                        raise error
+                    outstanding[name] -= 1
+                    if outstanding[name] == 0:
+                        finish(name)
+
+        self.timings["total"] = time.perf_counter() - run_start
+        return self.timings
+
+    def report(self):
+        """Prints the wall time of each builder and of the whole run."""
+        for name, seconds in self.timings.items():
+            print(f"{name:<12} {seconds * 1000:8.1f} ms")
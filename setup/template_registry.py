@@ -0,0 +1,237 @@
+import marshal
+import os
+import threading
+from pathlib import Path
+from string import Template
+
+CACHE_VERSION = 1
+# Rendered texts kept for reuse before the memo is cleared.
+RENDER_MEMO_SIZE = 512
+
+class CompiledTemplate:
+    """A string.Template split once into literal chunks and placeholder names.
+
+    Rendering joins the chunks with the values instead of running the
+    placeholder regex again, and names tells which variables the output
+    depends on. Raises ValueError for invalid placeholders, like
+    Template.substitute does.
+    """
+
+    def __init__(self, text):
+        literals = []
+        names = []
+        chunk = []
+        last = 0
+        for match in Template.pattern.finditer(text):
+            chunk.append(text[last:match.start()])
+            last = match.end()
+            name = match.group("named") or match.group("braced")
+            if name is not None:
+                literals.append("".join(chunk))
+                names.append(name)
+                chunk = []
+            elif match.group("escaped") is not None:
+                chunk.append(Template.delimiter)
+            else:
+                line = text.count("\n", 0, match.start("invalid")) + 1
+                raise ValueError(f"Invalid placeholder in template on line {line}")
+        chunk.append(text[last:])
+        literals.append("".join(chunk))
+        self.literals = literals
+        self.names = tuple(names)
+
+    def render(self, mapping):
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            parts.append(str(mapping[name]))
+            parts.append(literal)
+        return "".join(parts)
+
+class TemplateRegistry:
+    """Keeps every template under a template root loaded and compiled.
+
+    Templates are addressed by their path relative to the root, e.g.
+    ``gradle/build.gradle.kts.template``. load() reads them all at once;
+    until then get() reads just the template asked for, so a command that
+    renders one template does not pay for the rest. After that rendering
+    never touches the template files again. Each
+    entry remembers the mtime and size it was loaded with, which
+    ``refresh()`` and the optional marshal cache use to decide what to
+    reload.
+
+    render() compiles a template on first use and memoizes its output by
+    the values of the variables it actually references, so rendering many
+    variants re-renders a template only when one of its own variables
+    differs; everything else is reused.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, template_root: Path, cache_path=None):
+        self.template_root = Path(template_root)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._entries = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._compiled = {}
+        self._rendered = {}
+        self.renders = 0
+        self.reuses = 0
+
+    @classmethod
+    def shared(cls, template_root: Path):
+        """Returns the process-wide registry for template_root."""
+        key = Path(template_root).resolve()
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(key)
+            return cls._shared[key]
+
+    def _plain_entries(self):
+        return {name: (mtime_ns, size, template.template) for name, (mtime_ns, size, template) in self._entries.items()}
+
+    def export(self):
+        """Returns the loaded templates as plain data for another process."""
+        self._ensure_loaded()
+        return self._plain_entries()
+
+    @classmethod
+    def from_export(cls, template_root: Path, entries):
+        """Builds a loaded registry from export() data without touching the template files."""
+        registry = cls(template_root)
+        registry._entries = {name: (mtime_ns, size, Template(text)) for name, (mtime_ns, size, text) in entries.items()}
+        registry._loaded = True
+        return registry
+
+    def _read_cache(self):
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, 'rb') as f:
+                version, root, entries = marshal.load(f)
+        except (FileNotFoundError, EOFError, ValueError, TypeError):
+            return {}
+        if version != CACHE_VERSION or root != str(self.template_root.resolve()):
+            return {}
+        return entries
+
+    def _write_cache(self):
+        entries = self._plain_entries()
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((CACHE_VERSION, str(self.template_root.resolve()), entries), f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _load_entry(self, path: Path, stat):
+        with open(path, 'r') as f:
+            return (stat.st_mtime_ns, stat.st_size, Template(f.read()))
+
+    def load(self):
+        """Loads every template, taking unchanged ones from the persisted cache."""
+        cached = self._read_cache()
+        entries = {}
+        changed = False
+        for path in sorted(self.template_root.rglob("*.template")):
+            name = path.relative_to(self.template_root).as_posix()
+            stat = path.stat()
+            hit = cached.get(name)
+            if hit is not None and hit[0] == stat.st_mtime_ns and hit[1] == stat.st_size:
+                entries[name] = (hit[0], hit[1], Template(hit[2]))
+            else:
+                entries[name] = self._load_entry(path, stat)
+                changed = True
+
+        with self._lock:
+            self._entries = entries
+            self._loaded = True
+            self._forget_renders()
+        if self.cache_path is not None and (changed or len(entries) != len(cached)):
+            self._write_cache()
+
+    def refresh(self):
+        """Reloads templates whose mtime or size changed and returns their names."""
+        if not self._loaded:
+            self.load()
+            return sorted(self._entries)
+
+        reloaded = []
+        for name, (mtime_ns, size, _) in list(self._entries.items()):
+            path = self.template_root / name
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                with self._lock:
+                    del self._entries[name]
+                reloaded.append(name)
+                continue
+            if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+                with self._lock:
+                    self._entries[name] = self._load_entry(path, stat)
+                reloaded.append(name)
+        if reloaded:
+            with self._lock:
+                self._forget_renders()
+            if self.cache_path is not None:
+                self._write_cache()
+        return reloaded
+
+    def _forget_renders(self):
+        # Caller holds the lock.
+        self._compiled = {}
+        self._rendered = {}
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load()
+
+    def _ensure_entry(self, name):
+        if self._loaded or name in self._entries:
+            return
+        path = self.template_root / name
+        try:
+            entry = self._load_entry(path, path.stat())
+        except FileNotFoundError:
+            raise KeyError(name) from None
+        with self._lock:
+            self._entries.setdefault(name, entry)
+
+    def get(self, name):
+        """Returns the compiled Template stored under name, reading it on first use."""
+        self._ensure_entry(name)
+        return self._entries[name][2]
+
+    def text(self, name):
+        """Returns the raw text of a template that takes no substitutions."""
+        return self.get(name).template
+
+    def compiled(self, name):
+        """Returns the CompiledTemplate for name, compiling it on first use."""
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            compiled = CompiledTemplate(self.text(name))
+            with self._lock:
+                self._compiled[name] = compiled
+        return compiled
+
+    def render(self, name, mapping=None):
+        """Substitutes mapping into the template stored under name."""
+        compiled = self.compiled(name)
+        mapping = mapping or {}
+        key = (name, tuple(str(mapping[variable]) for variable in compiled.names))
+        with self._lock:
+            text = self._rendered.get(key)
+            if text is not None:
+                self.reuses += 1
+                return text
+        text = compiled.render(mapping)
+        with self._lock:
+            if len(self._rendered) >= RENDER_MEMO_SIZE:
+                self._rendered = {}
+            self._rendered[key] = text
+            self.renders += 1
+        return text
@@ -1,16 +1,31 @@
 #!/usr/bin/env python3
+import argparse
+import contextlib
 import os
-import shutil
 from pathlib import Path
 import subprocess
 import sys
+from string import Template
+
+from setup import profiling
+from setup.assets import ASSETS, find_asset
+from setup.gitimport import fast_import
+from setup.builders.base import DEFAULT_VARIABLES
+from setup.manifest import OutputManifest
+from setup.output import ArchiveBackend, DiskBackend, RecordingBackend
 
 class PluginSetup:
     """Sets up the repository structure for the JetBrains plugin project."""
 
-    def __init__(self, base_path):
+    def __init__(self, base_path, output=None, variables=None, use_fast_import=False):
         self.base_path = Path(base_path)
         self.plugin_path = self.base_path / "repo-structure-plugin"
+        self.output = output or DiskBackend(self.plugin_path, OutputManifest(self.plugin_path))
+        self.on_disk = isinstance(self.output, DiskBackend)
+        self.variables = {**DEFAULT_VARIABLES, **(variables or {})}
+        self.use_fast_import = use_fast_import and self.on_disk
+        if self.use_fast_import:
+            self.output = RecordingBackend(self.output)
 
     def create_directory_structure(self):
         """Creates the basic directory structure for the plugin."""
@@ -22,31 +37,31 @@ class PluginSetup:
         ]
 
         for directory in directories:
-            (self.plugin_path / directory).mkdir(parents=True, exist_ok=True)
+            self.output.mkdir(directory)
 
     def create_build_gradle(self):
         """Creates the build.gradle.kts file."""
         content = '''
     plugins {
         id("java")
-        id("org.jetbrains.kotlin.jvm") version "1.9.22"
-        id("org.jetbrains.intellij") version "1.17.2"
+        id("org.jetbrains.kotlin.jvm") version "${kotlin_version}"
+        id("org.jetbrains.intellij") version "${intellij_gradle_plugin_version}"
     }
     
-    group = "com.your.plugin"
-    version = "1.0-SNAPSHOT"
+    group = "${group}"
+    version = "${plugin_version}"
     
     repositories {
         mavenCentral()
     }
     
     kotlin {
-        jvmToolchain(17)
+        jvmToolchain(${jvm_toolchain})
     }
     
     intellij {
-        version.set("2023.3.3")
-        type.set("IC")
+        version.set("${intellij_version}")
+        type.set("${platform_type}")
         plugins.set(listOf(
             "com.intellij.java",
             "org.jetbrains.kotlin"
@@ -63,8 +78,8 @@ class PluginSetup:
         }
     
         patchPluginXml {
-            sinceBuild.set("233")
-            untilBuild.set("241.*")
+            sinceBuild.set("${since_build}")
+            untilBuild.set("${until_build}")
         }
     
         runIde {
@@ -74,14 +89,21 @@ class PluginSetup:
     }
         '''.strip()
 
-        with open(self.plugin_path / "build.gradle.kts", "w") as f:
-            f.write(content)
+        self.output.write("build.gradle.kts", Template(content).substitute(self.variables))
+
+    def create_gradle_wrapper(self):
+        """Creates the Gradle wrapper files."""
+        for relpath in ASSETS:
+            source = find_asset(self.base_path, relpath)
+            if source is None:
+                print(f"Asset {relpath} not found in the repository; skipped")
+                continue
+            self.output.copy(relpath, source)
 
     def create_settings_gradle(self):
         """Creates the settings.gradle.kts file."""
         content = 'rootProject.name = "repo-structure-plugin"'
-        with open(self.plugin_path / "settings.gradle.kts", "w") as f:
-            f.write(content)
+        self.output.write("settings.gradle.kts", content)
 
     def create_gradle_properties(self):
         """Creates the gradle.properties file."""
@@ -90,8 +112,7 @@ class PluginSetup:
 org.gradle.jvmargs=-Xmx2048M -Dkotlin.daemon.jvm.options\\="-Xmx2048M"
         '''.strip()
 
-        with open(self.plugin_path / "gradle.properties", "w") as f:
-            f.write(content)
+        self.output.write("gradle.properties", content)
 
     def create_gitignore(self):
         """Creates the .gitignore file."""
@@ -104,14 +125,13 @@ out/
 .DS_Store
         '''.strip()
 
-        with open(self.plugin_path / ".gitignore", "w") as f:
-            f.write(content)
+        self.output.write(".gitignore", content)
 
     def create_plugin_xml(self):
         """Creates the plugin.xml file."""
         content = '''
 <idea-plugin>
-    <id>com.your.plugin.repo-structure</id>
+    <id>${plugin_id}</id>
     <name>Repository Structure Documenter</name>
     <vendor>Your Name</vendor>
     <description>Automatically generates and updates repository structure documentation</description>
@@ -134,8 +154,7 @@ out/
 </idea-plugin>
         '''.strip()
 
-        with open(self.plugin_path / "src/main/resources/META-INF/plugin.xml", "w") as f:
-            f.write(content)
+        self.output.write("src/main/resources/META-INF/plugin.xml", Template(content).substitute(self.variables))
 
     def create_kotlin_files(self):
         """Creates the Kotlin source files."""
@@ -434,38 +453,57 @@ class UpdateStructureAction : AnAction() {
             '''.strip()
         }
 
-        kotlin_dir = self.plugin_path / "src/main/kotlin/com/your/plugin"
+        kotlin_dir = "src/main/kotlin/com/your/plugin"
         for filename, content in files.items():
-            with open(kotlin_dir / filename, "w") as f:
-                f.write(content)
+            self.output.write(f"{kotlin_dir}/{filename}", content)
 
     def init_git(self):
         """Initializes git repository."""
-        os.chdir(self.plugin_path)
-        subprocess.run(["git", "init"])
-        subprocess.run(["git", "add", "."])
-        subprocess.run(["git", "commit", "-m", "Initial plugin setup"])
+        with profiling.phase("git init"):
+            subprocess.run(["git", "init"], cwd=self.plugin_path)
+        if self.use_fast_import:
+            with profiling.phase("git fast-import"):
+                fast_import(self.plugin_path, self.output.files, "Initial plugin setup")
+            return
+        with profiling.phase("git add"):
+            subprocess.run(["git", "add", "."], cwd=self.plugin_path)
+        with profiling.phase("git commit"):
+            subprocess.run(["git", "commit", "-m", "Initial plugin setup"], cwd=self.plugin_path)
 
     def setup(self):
         """Runs the complete setup process."""
         print("Setting up plugin project structure...")
-
-        if self.plugin_path.exists():
-            response = input(f"{self.plugin_path} already exists. Delete it? (y/N): ")
-            if response.lower() == 'y':
-                shutil.rmtree(self.plugin_path)
-            else:
-                print("Setup aborted.")
-                return
-
-        self.create_directory_structure()
-        self.create_build_gradle()
-        self.create_settings_gradle()
-        self.create_gradle_properties()
-        self.create_gitignore()
-        self.create_plugin_xml()
-        self.create_kotlin_files()
-        self.init_git()
+        # Re-running over an existing project only rewrites the files whose
+        # content changed, as recorded in the output manifest, and keeps its
+        # git history.
+        existing_repo = self.on_disk and (self.plugin_path / ".git").exists()
+
+        steps = [
+            self.create_directory_structure,
+            self.create_build_gradle,
+            self.create_settings_gradle,
+            self.create_gradle_properties,
+            self.create_gitignore,
+            self.create_plugin_xml,
+            self.create_kotlin_files,
+            self.create_gradle_wrapper
+        ]
+        try:
+            for step in steps:
+                with profiling.phase(step.__name__):
+                    step()
+        finally:
+            with profiling.phase("output.close"):
+                self.output.close()
+        self.output.report()
+        if not self.on_disk:
+            print("Setup complete! The plugin project was written to the archive.")
+            return
+        if existing_repo:
+            print(f"{self.plugin_path} is already a git repository; commit the updated files yourself.")
+        else:
+            with profiling.phase("init_git"):
+                self.init_git()
 
         print(f"""
 Setup complete! Your plugin project has been created at:
@@ -483,6 +521,37 @@ For development:
 - Build configuration: build.gradle.kts
         """)
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Set up the repo-structure-plugin project in the current directory.")
+    parser.add_argument("--archive", metavar="FILE",
+                        help="stream the project into an archive instead of repo-structure-plugin/ (- for stdout)")
+    parser.add_argument("--archive-format", choices=ArchiveBackend.FORMATS,
+                        help="archive format (default: guessed from FILE, tar for stdout)")
+    parser.add_argument("--no-hardlinks", action="store_true",
+                        help="give the project its own copy of the Gradle wrapper instead of hard links")
+    parser.add_argument("--fast-import", action="store_true",
+                        help="create the initial commit with one git fast-import from memory instead of git add")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    output = None
+    if args.archive:
+        target = sys.stdout.buffer if args.archive == "-" else args.archive
+        output = ArchiveBackend(target, args.archive_format or ArchiveBackend.format_for(args.archive))
+    elif args.no_hardlinks:
+        plugin_path = Path.cwd() / "repo-structure-plugin"
+        output = DiskBackend(plugin_path, OutputManifest(plugin_path), link=False)
+
+    profiling.enable_from_args(args, "setup_plugin.py")
+    try:
+        setup = PluginSetup(os.getcwd(), output, use_fast_import=args.fast_import)
+        if args.archive == "-":
+            with contextlib.redirect_stdout(sys.stderr):
+                setup.setup()
+        else:
+            setup.setup()
+    finally:
+        profiling.finish()
+
 if __name__ == "__main__":
-    setup = PluginSetup(os.getcwd())
-    setup.setup()
\ No newline at end of file
+    main()
@@ -0,0 +1,93 @@
+import subprocess
+
+import pytest
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    for key in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{key}_NAME", "test")
+        monkeypatch.setenv(f"GIT_{key}_EMAIL", "test@example.com")
+    root = tmp_path / "repo"
+    root.mkdir()
+    git(root, "init", "-q")
+    return root
+
+def git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, stdout=subprocess.DEVNULL)
+
+def write(path, text=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+def structure(text):
+    """Returns the Directory Structure section of a document."""
+    start = text.index("```")
+    return text[start:text.index("```", start + 3)]
+
+def document(root, out, *options):
+    from documenter.__main__ import main
+
+    main([str(root), "--no-cache", "-j", "1", "-o", str(out), *options])
+    return out.read_text()
+
+def test_git_change_detection_matches_disk_scan(repo, tmp_path, monkeypatch):
+    write(repo / ".gitignore", "*.log\nbuild/\ntracked/\n")
+    write(repo / "src/main.py", '"""Main."""\n')
+    write(repo / "src/debug.log")
+    write(repo / "build/out/classes")
+    write(repo / "tracked/kept.txt")
+    (repo / "empty").mkdir()
+    (repo / "linked").symlink_to(repo / "src", target_is_directory=True)
+    (repo / "linked-file").symlink_to(repo / "src/main.py")
+    git(repo, "add", ".gitignore", "src/main.py", "linked", "linked-file")
+    git(repo, "add", "-f", "tracked/kept.txt")
+    git(repo, "commit", "-q", "-m", "initial")
+
+    def both():
+        texts = []
+        for options, cache in ((("--incremental",), "git"), (("--incremental", "--no-git"), "disk")):
+            monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / cache))
+            texts.append(structure(document(repo, tmp_path / f"{cache}.md", *options)))
+        texts.append(structure(document(repo, tmp_path / "walk.md")))
+        assert texts[0] == texts[1] == texts[2]
+        return texts[0]
+
+    listing = both()
+    assert "├── linked\n" in listing
+    assert "├── empty\n" in listing
+    assert "… 1 entry hidden" in listing
+
+    write(repo / "src/new.py", '"""New."""\n')
+    (repo / "empty/inner").mkdir()
+    (repo / "linked-file").unlink()
+    write(repo / "scratch/deep/notes.txt")
+    listing = both()
+    assert "new.py" in listing
+    assert "inner" in listing
+    assert "linked-file" not in listing
+
+    (repo / "scratch/deep/deeper").mkdir()
+    listing = both()
+    assert "deeper" in listing
+
+def test_incremental_run_rechecks_paths_dirty_last_time(repo, tmp_path):
+    out = tmp_path / "STRUCTURE.md"
+
+    write(repo / "main.py", '"""Original summary."""\n')
+    git(repo, "add", "main.py")
+    git(repo, "commit", "-q", "-m", "initial")
+    document(repo, out, "--incremental")
+
+    write(repo / "main.py", '"""Edited summary."""\n')
+    write(repo / "scratch.py", '"""Scratch."""\n')
+    text = document(repo, out, "--incremental")
+    assert "Edited summary." in text
+    assert "scratch.py" in text
+
+    git(repo, "checkout", "-q", "main.py")
+    (repo / "scratch.py").unlink()
+    text = document(repo, out, "--incremental")
+    assert "Original summary." in text
+    assert "Edited summary." not in text
+    assert "scratch.py" not in text
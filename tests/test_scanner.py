@@ -0,0 +1,18 @@
+import pytest
+
+from benchmarks.fuzz import EXTRACTION_CASES, SCANNERS
+from documenter.extract import doc_lines
+
+@pytest.mark.parametrize("kind, source, expected", EXTRACTION_CASES)
+def test_kotlin_java_extraction(kind, source, expected):
+    assert SCANNERS[kind](source) == expected
+
+def test_kotlin_string_template_keeps_enclosing_class(tmp_path):
+    path = tmp_path / "Widget.kt"
+    path.write_text('class Widget {\n    val s = "${"}"}"\n    /** After. */\n    fun after() = 1\n}\n')
+    assert doc_lines(path, path.name) == ["\n#### Widget.kt\n", "\n##### `fun Widget.after`\nAfter.\n"]
+
+def test_unreadable_file_has_no_doc_lines(tmp_path):
+    path = tmp_path / "Gone.kt"
+    path.symlink_to(tmp_path / "missing.kt")
+    assert doc_lines(path, path.name) == []